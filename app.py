@@ -180,7 +180,7 @@ STEP 0: SYNC WATCHLIST (Auto‑maintenance)
 CONTEXT:
 1. Portfolio cash ${portfolio.get('cash',0):,.2f}, equity ${portfolio.get('equity',0):,.2f}
    Positions: {owned_symbols}
-2. Watchlist: {watchlist}
+2. Watchlist: {sorted(watchlist)}
 
 BRIEFING STEPS:
 - Review held positions, watchlist moves, top headlines, sentiment, risk checks, and give recommendations.
@@ -270,8 +270,9 @@ def sync_watchlist() -> str:
     portfolio = get_positions()
     owned_symbols = list(portfolio.get("positions", {}).keys())
     watchlist = _load_watchlist()
+    owned_set = set(owned_symbols)
     owned_but_not_watched = [s for s in owned_symbols if s not in watchlist]
-    watched_but_not_owned = [s for s in watchlist if s not in owned_symbols]
+    watched_but_not_owned = [s for s in sorted(watchlist) if s not in owned_set]
     return f"""
 Synchronize watchlist with portfolio.
 Add missing owned symbols: {owned_but_not_watched}
@@ -771,7 +772,7 @@ if __name__ == "__main__":
     logger.info("Starting MonteWalk Gradio MCP Server...")
     server_name = os.getenv("GRADIO_SERVER_NAME", "localhost")
     server_port = int(os.getenv("GRADIO_SERVER_PORT", "7860"))
-    logger.info(f"UI URL: http://{server_name}:{server_port}")
+    logger.info("UI URL: http://%s:%s", server_name, server_port)
     logger.info("MCP enabled – tools available to clients")
     
     demo.launch(
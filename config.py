@@ -14,9 +14,17 @@ PORTFOLIO_FILE = DATA_DIR / "portfolio.json"
 
 LOG_FILE = DATA_DIR / "activity.log"
 
+# On-disk cache for historical market data downloads
+CACHE_DIR = Path.home() / ".cache" / "montewalk"
+
 # Risk Settings
 DEFAULT_LOOKBACK_PERIOD = "1y"
 RISK_FREE_RATE = 0.04  # 4% for Sharpe Ratio calcs
+# MCP server tool modules to register, e.g. "market_data,risk_engine" (empty = all).
+# Enabled modules are imported at start-up; modules left out are not imported at all.
+MCP_TOOL_MODULES = [m.strip() for m in os.getenv("MCP_TOOL_MODULES", "").split(",") if m.strip()]
+# Monte Carlo path generator: "numba" (CPU) or "jax" (GPU/TPU when available, needs jax installed)
+MC_BACKEND = os.getenv("MC_BACKEND", "numba").lower()
 
 # Backtesting Defaults
 DEFAULT_BACKTEST_START = "2020-01-01"
@@ -1,25 +1,20 @@
 from mcp.server.fastmcp import FastMCP
+import asyncio
+import importlib
+import json
 import logging
+import string
 import sys
-from typing import List, Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Callable, Tuple
 from dotenv import load_dotenv
 
 load_dotenv()
 
-from config import LOG_FILE
+from config import LOG_FILE, MCP_TOOL_MODULES
 
 
-from tools.market_data import get_price, get_fundamentals, get_orderbook
-from tools.execution import place_order, cancel_order, get_positions, flatten, get_order_history
-from tools.risk_engine import portfolio_risk, var, max_drawdown, monte_carlo_simulation
-from tools.backtesting import run_backtest, walk_forward_analysis
-from tools.feature_engineering import compute_indicators, rolling_stats, get_technical_summary
-from tools.portfolio_optimizer import mean_variance_optimize, risk_parity
-from tools.logger import setup_logging, log_action
-from tools.news_intelligence import get_news, analyze_sentiment, get_symbol_sentiment
-from tools.watchlist import add_to_watchlist, remove_from_watchlist, get_watchlist_data
-from tools.crypto_data import get_crypto_price, get_crypto_market_data, get_trending_crypto, search_crypto
-from tools.alpaca_broker import get_broker
+from tools.logger import setup_logging
 
 setup_logging()
 logger = logging.getLogger(__name__)
@@ -28,6 +23,9 @@ logger = logging.getLogger(__name__)
 mcp = FastMCP("MonteWalk")
 logger.info("MonteWalk MCP Server initializing...")
 
+# Shared pool for overlapping independent blocking I/O (Alpaca REST, disk)
+_executor = ThreadPoolExecutor(max_workers=4)
+
 # Health check
 @mcp.tool()
 def health_check() -> str:
@@ -39,6 +37,8 @@ def get_account_info() -> str:
     """
     Get detailed Alpaca account information including equity, buying power, and day trade status.
     """
+    from tools.alpaca_broker import get_broker
+    
     try:
         broker = get_broker()
         account = broker.get_account()
@@ -55,15 +55,27 @@ Day Trade Count: {account['daytrade_count']}
     except Exception as e:
         return f"ERROR: Failed to get account info - {str(e)}"
 
+_POS_LINE = "{symbol}: {qty} shares @ ${current_price:.2f} (P/L: ${unrealized_pl:,.2f} / {plpc:+.2f}%)"
+
+
+def _fmt_position(item) -> str:
+    """Format a (symbol, details) position pair as one summary line."""
+    symbol, details = item
+    return _POS_LINE.format_map({**details, "symbol": symbol, "plpc": details["unrealized_plpc"] * 100})
+
 @mcp.resource("portfolio://summary")
 def get_portfolio_summary() -> str:
     """
     Returns a live summary of the portfolio from Alpaca (Cash, Positions, Equity).
     """
+    from tools.alpaca_broker import get_broker
+    
     try:
         broker = get_broker()
-        account = broker.get_account()
-        positions = broker.get_all_positions()
+        f_acc = _executor.submit(broker.get_account)
+        f_pos = _executor.submit(broker.get_all_positions)
+        account = f_acc.result()
+        positions = f_pos.result()
         
         summary = [
             "=== PORTFOLIO SUMMARY (Alpaca Paper Trading) ===",
@@ -74,15 +86,7 @@ def get_portfolio_summary() -> str:
             "--- Holdings ---"
         ]
         
-        for symbol, details in positions.items():
-            qty = details['qty']
-            price = details['current_price']
-            pl = details['unrealized_pl']
-            pl_pct = details['unrealized_plpc'] * 100
-            summary.append(
-                f"{symbol}: {qty} shares @ ${price:.2f} "
-                f"(P/L: ${pl:,.2f} / {pl_pct:+.2f}%)"
-            )
+        summary.extend(map(_fmt_position, positions.items()))
             
         if not positions:
             summary.append("(No open positions)")
@@ -96,6 +100,8 @@ def get_watchlist_resource() -> str:
     """
     Returns a live view of the watchlist with current prices.
     """
+    from tools.watchlist import get_watchlist_data
+    
     data = get_watchlist_data()
     if not data:
         return "Watchlist is empty. Use add_to_watchlist() to track symbols."
@@ -123,22 +129,78 @@ def get_crypto_resource() -> str:
     """
     Returns the top trending cryptocurrencies.
     """
+    from tools.crypto_data import get_trending_crypto
     return get_trending_crypto()
 
 
 # --- PROMPTS ---
 
+# Prompt bodies that only depend on their arguments are built once here
+_ANALYZE_TICKER_TPL = string.Template("""
+Please perform a comprehensive analysis on $symbol.
+
+STEPS:
+1. Use `get_price` to check the trend (1y and 5d).
+2. Use `get_fundamentals` to check valuation (PE, Margins).
+3. Use `get_news` and `analyze_sentiment` to gauge market mood.
+4. Use `compute_indicators` (RSI, MACD) for technicals.
+
+OUTPUT:
+- Executive Summary (Buy/Sell/Hold)
+- Key Risks
+- Technical Levels (Support/Resistance)
+""")
+
+_BACKTEST_STRATEGY_TPL = string.Template("""
+Please backtest a trading strategy for $symbol.
+
+STRATEGY:
+- Moving Average Crossover: Fast MA=$fast_ma, Slow MA=$slow_ma
+
+STEPS:
+1. Use `run_backtest("$symbol", $fast_ma, $slow_ma, "2020-01-01", "2023-12-31")` for historical test
+2. Use `walk_forward_analysis("$symbol")` for out-of-sample validation
+3. Compare strategy return vs Buy & Hold
+4. Analyze the Sharpe ratio and max drawdown
+
+OUTPUT:
+- Is this strategy viable? (Yes/No/Maybe)
+- Key weaknesses of the strategy
+- Suggested parameter improvements
+""")
+
+_CRYPTO_MARKET_UPDATE_PROMPT = """
+Please generate a Crypto Market Update.
+
+STEPS:
+1. Use `get_trending_crypto()` to see what's hot
+2. Use `get_crypto_market_data("bitcoin")` for BTC analysis
+3. Use `get_crypto_market_data("ethereum")` for ETH analysis
+4. Use `get_crypto_price()` for any other coins of interest
+
+OUTPUT:
+- Market Sentiment (Bullish/Bearish/Neutral)
+- Top 3 Trending Coins with analysis
+- BTC & ETH price levels and support/resistance
+- Any notable price movements or news
+"""
+
 @mcp.prompt()
-def morning_briefing() -> str:
+async def morning_briefing() -> str:
     """
-    Generates a morning briefing prompt with Portfolio and Watchlist context.
+    Generates a morning briefing prompt with Portfolio, Watchlist and News context.
     """
     from tools.execution import get_positions
     from tools.watchlist import _load_watchlist
+    from tools.news_intelligence import get_latest_news_for_watchlist
     
-    portfolio = get_positions()
+    # Independent blocking fetches, overlapped off the event loop
+    portfolio, watchlist, news = await asyncio.gather(
+        asyncio.to_thread(get_positions),
+        asyncio.to_thread(_load_watchlist),
+        asyncio.to_thread(get_latest_news_for_watchlist),
+    )
     owned_symbols = list(portfolio.get('positions', {}).keys())
-    watchlist = _load_watchlist()
     
     # Detect sync issues
     owned_but_not_watched = [s for s in owned_symbols if s not in watchlist]
@@ -159,7 +221,10 @@ CONTEXT:
    - Positions: {owned_symbols}
 
 2. Watchlist:
-   - Symbols: {watchlist}
+   - Symbols: {sorted(watchlist)}
+
+3. Latest Headlines:
+{news}
 
 BRIEFING STEPS:
 1. Review the performance of my held positions (check today's moves)
@@ -180,20 +245,7 @@ def analyze_ticker(symbol: str) -> str:
     """
     Deep dive analysis prompt for a specific ticker.
     """
-    return f"""
-Please perform a comprehensive analysis on {symbol}.
-
-STEPS:
-1. Use `get_price` to check the trend (1y and 5d).
-2. Use `get_fundamentals` to check valuation (PE, Margins).
-3. Use `get_news` and `analyze_sentiment` to gauge market mood.
-4. Use `compute_indicators` (RSI, MACD) for technicals.
-
-OUTPUT:
-- Executive Summary (Buy/Sell/Hold)
-- Key Risks
-- Technical Levels (Support/Resistance)
-"""
+    return _ANALYZE_TICKER_TPL.substitute(symbol=symbol)
 
 @mcp.prompt()
 def risk_analysis() -> str:
@@ -209,7 +261,7 @@ def risk_analysis() -> str:
 Please perform a comprehensive risk analysis on my portfolio.
 
 CURRENT HOLDINGS:
-{dict(positions)}
+{json.dumps(positions, default=str, indent=2)}
 
 ANALYSIS STEPS:
 1. Use `portfolio_risk()` to calculate current volatility
@@ -229,44 +281,14 @@ def backtest_strategy(symbol: str, fast_ma: int = 10, slow_ma: int = 50) -> str:
     """
     Backtesting workflow prompt.
     """
-    return f"""
-Please backtest a trading strategy for {symbol}.
-
-STRATEGY:
-- Moving Average Crossover: Fast MA={fast_ma}, Slow MA={slow_ma}
-
-STEPS:
-1. Use `run_backtest("{symbol}", {fast_ma}, {slow_ma}, "2020-01-01", "2023-12-31")` for historical test
-2. Use `walk_forward_analysis("{symbol}")` for out-of-sample validation
-3. Compare strategy return vs Buy & Hold
-4. Analyze the Sharpe ratio and max drawdown
-
-OUTPUT:
-- Is this strategy viable? (Yes/No/Maybe)
-- Key weaknesses of the strategy
-- Suggested parameter improvements
-"""
+    return _BACKTEST_STRATEGY_TPL.substitute(symbol=symbol, fast_ma=fast_ma, slow_ma=slow_ma)
 
 @mcp.prompt()
 def crypto_market_update() -> str:
     """
     Cryptocurrency market analysis prompt.
     """
-    return f"""
-Please generate a Crypto Market Update.
-
-STEPS:
-1. Use `get_trending_crypto()` to see what's hot
-2. Use `get_crypto_market_data("bitcoin")` for BTC analysis
-3. Use `get_crypto_market_data("ethereum")` for ETH analysis
-4. Use `get_crypto_price()` for any other coins of interest
-
-OUTPUT:
-- Market Sentiment (Bullish/Bearish/Neutral)
-- Top 3 Trending Coins with analysis
-- BTC & ETH price levels and support/resistance
-- Any notable price movements or news
-"""
+    return _CRYPTO_MARKET_UPDATE_PROMPT
 
 @mcp.prompt()
 def portfolio_rebalance(target_symbols: str = "AAPL,MSFT,GOOGL") -> str:
@@ -305,16 +327,17 @@ def sync_watchlist() -> str:
     owned_symbols = list(portfolio.get('positions', {}).keys())
     watchlist = _load_watchlist()
     
-    # Find discrepancies
+    # Find discrepancies (set lookups; positions order and sorted watchlist for display)
+    owned_set = set(owned_symbols)
     owned_but_not_watched = [s for s in owned_symbols if s not in watchlist]
-    watched_but_not_owned = [s for s in watchlist if s not in owned_symbols]
+    watched_but_not_owned = [s for s in sorted(watchlist) if s not in owned_set]
     
     return f"""
 Please synchronize my watchlist with my actual portfolio holdings.
 
 CURRENT STATE:
 1. Portfolio Holdings: {owned_symbols}
-2. Watchlist: {watchlist}
+2. Watchlist: {sorted(watchlist)}
 
 DISCREPANCIES DETECTED:
 - Owned but NOT in watchlist: {owned_but_not_watched if owned_but_not_watched else 'None ✅'}
@@ -353,74 +376,63 @@ Run this sync automatically:
 
 
 def register_tools(tools: List[Callable], category: str):
-    """Helper to register multiple tools with logging."""
-    for tool in tools:
-        try:
+    """Helper to register multiple tools with one log line per category."""
+    names = []
+    tool = None
+    try:
+        for tool in tools:
             mcp.tool()(tool)
-            logger.info(f"Registered {category} tool: {tool.__name__}")
-        except Exception as e:
-            logger.error(f"Failed to register {tool.__name__}: {e}")
-            raise
+            names.append(tool.__name__)
+    except Exception as e:
+        logger.error("Failed to register %s tool %s: %s", category, tool.__name__, e)
+        raise RuntimeError(f"Failed while registering {category}: {tool.__name__}: {e}") from e
+    logger.info("Registered %s tools: %s", category, names)
 
 
 # Tool Registration
+# (category, module, tool names). This is module selection, not lazy loading:
+# FastMCP reads each tool's signature when it is registered, so every enabled
+# module is imported at start-up. By default all modules are enabled and
+# start-up cost is the same as plain imports; MCP_TOOL_MODULES restricts the
+# server to the listed modules, and only those are imported.
+TOOL_REGISTRY: List[Tuple[str, str, List[str]]] = [
+    ("Market Data", "tools.market_data", ["get_price", "get_fundamentals", "get_orderbook"]),
+    ("Execution", "tools.execution", ["place_order", "cancel_order", "get_positions", "flatten", "get_order_history"]),
+    ("Risk Engine", "tools.risk_engine", ["portfolio_risk", "var", "max_drawdown", "monte_carlo_simulation"]),
+    ("Backtesting", "tools.backtesting", ["run_backtest", "walk_forward_analysis"]),
+    ("Feature Engineering", "tools.feature_engineering", ["compute_indicators", "rolling_stats", "get_technical_summary"]),
+    ("Portfolio Optimization", "tools.portfolio_optimizer", ["mean_variance_optimize", "risk_parity"]),
+    ("Logging", "tools.logger", ["log_action"]),
+    ("News & Sentiment", "tools.news_intelligence", ["get_news", "analyze_sentiment", "get_symbol_sentiment"]),
+    ("Watchlist", "tools.watchlist", ["add_to_watchlist", "remove_from_watchlist"]),
+    ("Cryptocurrency", "tools.crypto_data", ["get_crypto_price", "get_crypto_market_data", "get_trending_crypto", "search_crypto"]),
+]
+
+
+def _load_tools(module_path: str, names: List[str]) -> List[Callable]:
+    """Import a tool module and return the named tool functions."""
+    module = importlib.import_module(module_path)
+    return [getattr(module, name) for name in names]
+
+
 try:
     logger.info("Starting Quant Agent MCP Server initialization...")
     
-    register_tools(
-        [get_price, get_fundamentals, get_orderbook],
-        "Market Data"
-    )
-    
-    register_tools(
-        [place_order, cancel_order, get_positions, flatten, get_order_history],
-        "Execution"
-    )
-    
-    register_tools(
-        [portfolio_risk, var, max_drawdown, monte_carlo_simulation],
-        "Risk Engine"
-    )
-    
-    register_tools(
-        [run_backtest, walk_forward_analysis],
-        "Backtesting"
-    )
-    
-    register_tools(
-        [compute_indicators, rolling_stats, get_technical_summary],
-        "Feature Engineering"
-    )
-    
-    register_tools(
-        [mean_variance_optimize, risk_parity],
-        "Portfolio Optimization"
-    )
+    known = {module_path.rsplit(".", 1)[-1] for _, module_path, _ in TOOL_REGISTRY}
+    unknown = set(MCP_TOOL_MODULES) - known
+    if unknown:
+        logger.warning("Ignoring unknown MCP_TOOL_MODULES entries: %s", sorted(unknown))
     
-    register_tools(
-        [log_action],
-        "Logging"
-    )
-    
-    register_tools(
-        [get_news, analyze_sentiment, get_symbol_sentiment],
-        "News & Sentiment"
-    )
-    
-    register_tools(
-        [add_to_watchlist, remove_from_watchlist],
-        "Watchlist"
-    )
-    
-    register_tools(
-        [get_crypto_price, get_crypto_market_data, get_trending_crypto, search_crypto],
-        "Cryptocurrency"
-    )
+    for category, module_path, names in TOOL_REGISTRY:
+        if MCP_TOOL_MODULES and module_path.rsplit(".", 1)[-1] not in MCP_TOOL_MODULES:
+            logger.info("Skipping %s tools (not in MCP_TOOL_MODULES)", category)
+            continue
+        register_tools(_load_tools(module_path, names), category)
     
     logger.info("All tools registered successfully.")
     
 except Exception as e:
-    logger.critical(f"Failed to initialize server: {e}")
+    logger.critical("Failed to initialize server: %s", e)
     sys.exit(1)
 
 
@@ -431,5 +443,5 @@ if __name__ == "__main__":
     except KeyboardInterrupt:
         logger.info("Server shutdown by user.")
     except Exception as e:
-        logger.critical(f"Server crashed: {e}")
+        logger.critical("Server crashed: %s", e)
         sys.exit(1)
@@ -145,3 +145,17 @@ def test_flatten():
         portfolio = get_positions()
         assert len(portfolio['positions']) == 0, f"Failed to flatten all positions. {len(portfolio['positions'])} still remain."
         print("All positions have been successfully closed.")
+
+def test_account_reads_are_cached(broker):
+    """Repeated account reads share one REST call until an order invalidates them."""
+    broker.invalidate_cache()
+    client = broker.trading_client
+    client.get_account.reset_mock()
+
+    broker.get_account()
+    broker.get_account()
+    assert client.get_account.call_count == 1
+
+    broker.cancel_order("test_order_123")
+    broker.get_account()
+    assert client.get_account.call_count == 2
@@ -2,6 +2,7 @@ import sys
 import os
 import pytest
 import json
+import pandas as pd
 from unittest.mock import patch
 
 # Add project root to path
@@ -41,6 +42,26 @@ def test_get_price_failure():
         assert data == [], "Should return empty list on error"
     print("Correctly handled failure for get_price.")
 
+def test_get_price_records_format():
+    """get_price emits one record per bar with the offset-bearing date and full-precision numbers."""
+    index = pd.date_range("2024-01-02", periods=2, freq="D", tz="America/New_York", name="Date")
+    history = pd.DataFrame({"Close": [185.123456789012, 184.25], "Volume": [1000, 2000]}, index=index)
+    with patch('tools.market_data.cached_history', return_value=history):
+        data = json.loads(get_price("AAPL", period="5d"))
+    assert data == [
+        {"Date": "2024-01-02 00:00:00-05:00", "Close": 185.123456789012, "Volume": 1000},
+        {"Date": "2024-01-03 00:00:00-05:00", "Close": 184.25, "Volume": 2000},
+    ]
+
+def test_place_order_rejects_oversized_order():
+    """The pre-trade risk check values the order at the last trade price."""
+    with patch('tools.execution.broker') as broker, \
+         patch('tools.execution._last_price', return_value=100.0), \
+         patch('tools.risk_engine.get_positions', return_value={"cash": 1000.0, "positions": {}}):
+        result = place_order("AAPL", "buy", 10)
+        assert isinstance(result, str) and result.startswith("Risk Rejection")
+        broker.submit_market_order.assert_not_called()
+
 def test_place_order(mock_broker):
     """Test placing an order."""
     # This test is mocked to avoid actual trades.
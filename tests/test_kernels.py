@@ -0,0 +1,107 @@
+import sys
+import os
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+from tools._kernels import (
+    ma_crossover_backtest,
+    ma_crossover_sumret,
+    ma_grid_sumret,
+    mc_final_values,
+    walk_forward_windows,
+)
+
+
+def _prices(n: int, seed: int = 0) -> pd.Series:
+    """Synthetic geometric random walk of daily closes."""
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0003, 0.02, n)
+    index = pd.date_range("2020-01-01", periods=n, freq="B")
+    return pd.Series(100 * np.exp(np.cumsum(returns)), index=index)
+
+
+@pytest.mark.parametrize("fast,slow", [(10, 50), (20, 100), (50, 200), (10, 400)])
+def test_ma_crossover_sumret_matches_pandas(fast, slow):
+    """Kernel reproduces the pandas rolling-mean crossover return sum."""
+    close = _prices(300)
+    fast_ma = close.rolling(window=fast).mean()
+    slow_ma = close.rolling(window=slow).mean()
+    signal = (fast_ma > slow_ma).astype(int).shift(1)
+    expected = (close.pct_change() * signal).sum()
+
+    result = ma_crossover_sumret(close.to_numpy(dtype=np.float64), fast, slow)
+    assert result == pytest.approx(expected, abs=1e-12)
+
+
+def test_ma_grid_sumret_matches_single_pair_kernel():
+    """Grid kernel returns the same per-pair sums as the single-pair kernel."""
+    close = _prices(400, seed=1).to_numpy(dtype=np.float64)
+    windows = np.array([10, 20, 50, 100, 200], dtype=np.int64)
+    pairs = [(10, 50), (10, 100), (20, 200), (50, 100), (50, 200)]
+    k2i = {int(k): i for i, k in enumerate(windows)}
+    pair_fast = np.array([k2i[f] for f, _ in pairs], dtype=np.int64)
+    pair_slow = np.array([k2i[s] for _, s in pairs], dtype=np.int64)
+
+    perfs = ma_grid_sumret(close, windows, pair_fast, pair_slow)
+    expected = [ma_crossover_sumret(close, f, s) for f, s in pairs]
+    assert perfs == pytest.approx(expected, abs=1e-12)
+
+
+def test_walk_forward_windows_matches_serial_loop():
+    """Parallel window kernel picks the same pairs and returns as a serial loop."""
+    close = _prices(1000, seed=3).to_numpy(dtype=np.float64)
+    windows = np.array([10, 20, 50, 100, 200], dtype=np.int64)
+    pair_fast = np.array([0, 0, 1, 1, 2, 2], dtype=np.int64)
+    pair_slow = np.array([2, 3, 3, 4, 3, 4], dtype=np.int64)
+    train_len, test_len = 252, 63
+    starts = np.arange(0, len(close) - train_len - test_len, test_len, dtype=np.int64)
+
+    best_pair, test_returns = walk_forward_windows(
+        close, starts, train_len, test_len, windows, pair_fast, pair_slow
+    )
+    for w, a in enumerate(starts):
+        b = a + train_len
+        q = int(np.argmax(ma_grid_sumret(close[a:b], windows, pair_fast, pair_slow)))
+        f, s = windows[pair_fast[q]], windows[pair_slow[q]]
+        assert best_pair[w] == q
+        assert test_returns[w] == pytest.approx(ma_crossover_sumret(close[b:b + test_len], f, s), abs=1e-12)
+
+
+@pytest.mark.parametrize("fast,slow", [(10, 50), (50, 20)])
+def test_ma_crossover_backtest_matches_pandas(fast, slow):
+    """Fused backtest kernel reproduces the pandas equity curve and metrics."""
+    close = _prices(500, seed=2)
+    fast_ma = close.rolling(window=fast).mean()
+    slow_ma = close.rolling(window=slow).mean()
+    market_ret = close.pct_change()
+    strategy_ret = market_ret * (fast_ma > slow_ma).astype(int).shift(1)
+    cum_ret = (1 + strategy_ret).cumprod()
+    max_dd = (cum_ret / cum_ret.expanding(min_periods=1).max() - 1).min()
+    sharpe = strategy_ret.mean() / strategy_ret.std() * np.sqrt(252)
+
+    equity, buyhold, k_sharpe, k_max_dd = ma_crossover_backtest(
+        close.to_numpy(dtype=np.float64), fast, slow
+    )
+    assert equity[1:] == pytest.approx(cum_ret.iloc[1:].to_numpy(), rel=1e-10)
+    assert buyhold[-1] - 1 == pytest.approx((1 + market_ret).prod() - 1, rel=1e-10)
+    assert k_sharpe == pytest.approx(sharpe, rel=1e-9)
+    assert k_max_dd == pytest.approx(max_dd, rel=1e-10)
+
+
+def test_mc_final_values_matches_lognormal_moments():
+    """Terminal log values have mean days * w.mu and variance days * w'Σw."""
+    cov = np.array([[4e-4, 1e-4, 0.0], [1e-4, 2e-4, 5e-5], [0.0, 5e-5, 1e-4]])
+    L = np.linalg.cholesky(cov)
+    mu = np.array([5e-4, 3e-4, 1e-4])
+    w = np.array([0.5, 0.3, 0.2])
+    days, sims = 50, 40000
+    shocks = np.random.default_rng(4).standard_normal((sims, days))
+
+    log_final = np.log(mc_final_values(L, mu, w, shocks))
+    assert log_final.mean() == pytest.approx(days * w @ mu, abs=2.5e-3)
+    assert log_final.var() == pytest.approx(days * w @ cov @ w, rel=0.05)
+
@@ -0,0 +1,232 @@
+"""
+Numba kernels for the backtesting and risk hot loops.
+Each kernel takes contiguous float64 arrays and does the work in a single pass.
+"""
+
+import numpy as np
+from numba import njit, prange
+
+
+@njit(cache=True, fastmath=True)
+def ma_crossover_sumret(close, fast, slow):
+    """
+    Sum of daily returns of a long-only MA crossover strategy.
+
+    Equivalent to ``(close.pct_change() * (sma_fast > sma_slow).shift(1)).sum()``
+    with pandas rolling means, but keeps running window sums instead of
+    recomputing each window. Requires ``fast < slow``.
+
+    Args:
+        close: float64 price array
+        fast: Fast moving average window
+        slow: Slow moving average window
+
+    Returns:
+        Sum of strategy returns over the series
+    """
+    n = close.shape[0]
+    if n <= slow:
+        # The signal never turns on, so every strategy return is zero
+        return 0.0
+    # Prime both windows on the bars up to slow - 1, the first bar where
+    # both MAs exist; the strategy is flat (zero return) until then
+    sum_f = 0.0
+    for j in range(slow - fast, slow):
+        sum_f += close[j]
+    sum_s = sum_f
+    for j in range(slow - fast):
+        sum_s += close[j]
+    # fast_ma > slow_ma, cross-multiplied to avoid the divides
+    sig_prev = np.float64(sum_f * slow > sum_s * fast)
+    total = 0.0
+    for i in range(slow, n):
+        total += sig_prev * (close[i] / close[i - 1] - 1.0)
+        sum_f += close[i] - close[i - fast]
+        sum_s += close[i] - close[i - slow]
+        sig_prev = np.float64(sum_f * slow > sum_s * fast)
+    return total
+
+
+@njit(cache=True, fastmath=True)
+def ma_grid_sumret(close, windows, pair_fast, pair_slow):
+    """
+    ma_crossover_sumret for many (fast, slow) pairs in one pass.
+
+    A running sum is kept once per distinct window, so a grid of P pairs over
+    K distinct windows costs K window updates per bar instead of 2P.
+
+    Args:
+        close: float64 price array
+        windows: int64 array of distinct MA windows
+        pair_fast: int64 indices into ``windows`` for each pair's fast MA
+        pair_slow: int64 indices into ``windows`` for each pair's slow MA
+
+    Returns:
+        float64 array with the strategy return sum of each pair
+    """
+    n = close.shape[0]
+    k = windows.shape[0]
+    p = pair_fast.shape[0]
+    sums = np.zeros(k)
+    sig_prev = np.zeros(p)
+    totals = np.zeros(p)
+    for i in range(n):
+        for j in range(k):
+            sums[j] += close[i]
+            if i >= windows[j]:
+                sums[j] -= close[i - windows[j]]
+        ret = close[i] / close[i - 1] - 1.0 if i >= 1 else 0.0
+        for q in range(p):
+            fw = windows[pair_fast[q]]
+            sw = windows[pair_slow[q]]
+            totals[q] += sig_prev[q] * ret
+            sig_prev[q] = np.float64((i >= sw - 1) & (sums[pair_fast[q]] * sw > sums[pair_slow[q]] * fw))
+    return totals
+
+
+@njit(cache=True, parallel=True)
+def walk_forward_windows(close, starts, train_len, test_len, windows, pair_fast, pair_slow):
+    """
+    Walk-forward optimization over all (train, test) windows in parallel.
+
+    Windows are independent, so each one runs the grid search on its train
+    slice and scores the winning pair on its test slice on its own thread.
+
+    Args:
+        close: float64 price array
+        starts: int64 start index of each train slice
+        train_len: Bars per train slice
+        test_len: Bars per test slice, starting right after the train slice
+        windows, pair_fast, pair_slow: Parameter grid as for ma_grid_sumret
+
+    Returns:
+        (best_pair, test_returns): index of the winning pair and its test
+        return sum, per window
+    """
+    n = starts.shape[0]
+    best_pair = np.empty(n, dtype=np.int64)
+    test_returns = np.empty(n)
+    for w in prange(n):
+        a = starts[w]
+        b = a + train_len
+        perfs = ma_grid_sumret(close[a:b], windows, pair_fast, pair_slow)
+        q = np.argmax(perfs)
+        best_pair[w] = q
+        test_returns[w] = ma_crossover_sumret(
+            close[b:b + test_len], windows[pair_fast[q]], windows[pair_slow[q]]
+        )
+    return best_pair, test_returns
+
+
+@njit(cache=True, fastmath=True)
+def ma_crossover_backtest(close, fast, slow):
+    """
+    Full MA crossover backtest in a single pass over the prices.
+
+    Fuses the SMA, signal, return, equity curve, drawdown and Sharpe steps
+    that would otherwise each materialize a pandas Series.
+
+    Args:
+        close: float64 price array
+        fast: Fast moving average window
+        slow: Slow moving average window
+
+    Returns:
+        (strategy_equity, buyhold_equity, sharpe, max_drawdown) where the
+        equity arrays start at 1.0 on the first bar
+    """
+    n = close.shape[0]
+    longest = max(fast, slow)
+    strategy_equity = np.ones(n)
+    buyhold_equity = np.ones(n)
+    buyhold = 1.0
+
+    # Warm-up: until both MAs exist the strategy is flat, so only buy & hold
+    # moves; the equity, drawdown and zero-return statistics stay at rest
+    warmup = min(longest, n)
+    for i in range(1, warmup):
+        buyhold *= 1.0 + (close[i] / close[i - 1] - 1.0)
+        buyhold_equity[i] = buyhold
+    equity = 1.0
+    peak = 1.0
+    max_dd = 0.0
+    # Welford running mean/variance of the daily strategy returns
+    count = max(warmup - 1, 0)
+    mean = 0.0
+    m2 = 0.0
+    if n <= longest:
+        sig_prev = 0.0
+    else:
+        sum_f = 0.0
+        for j in range(longest - fast, longest):
+            sum_f += close[j]
+        sum_s = 0.0
+        for j in range(longest - slow, longest):
+            sum_s += close[j]
+        sig_prev = np.float64(sum_f * slow > sum_s * fast)
+
+    for i in range(longest, n):
+        market_ret = close[i] / close[i - 1] - 1.0
+        strategy_ret = sig_prev * market_ret
+        buyhold *= 1.0 + market_ret
+        equity *= 1.0 + strategy_ret
+        peak = max(peak, equity)
+        max_dd = min(max_dd, equity / peak - 1.0)
+        count += 1
+        delta = strategy_ret - mean
+        mean += delta / count
+        m2 += delta * (strategy_ret - mean)
+        strategy_equity[i] = equity
+        buyhold_equity[i] = buyhold
+        sum_f += close[i] - close[i - fast]
+        sum_s += close[i] - close[i - slow]
+        sig_prev = np.float64(sum_f * slow > sum_s * fast)
+
+    sharpe = np.nan
+    if count > 1:
+        std = np.sqrt(m2 / (count - 1))
+        if std > 0.0:
+            sharpe = mean / std * np.sqrt(252.0)
+    if count == 0:
+        max_dd = np.nan
+    return strategy_equity, buyhold_equity, sharpe, max_dd
+
+
+@njit(cache=True, parallel=True, fastmath=True)
+def mc_final_values(L, mu, w, shocks):
+    """
+    Terminal values of simulated portfolio paths under correlated GBM.
+
+    Only the portfolio projection of each daily shock matters:
+    w . (mu + L z) = w . mu + (L.T w) . z, which is N(0, |L.T w|^2). So one
+    standard normal per path and day is exact in distribution, and the
+    randoms can come from a seeded numpy Generator outside the kernel.
+
+    Args:
+        L: (K, K) covariance factor of daily log returns (cov = L @ L.T)
+        mu: (K,) mean daily log returns
+        w: (K,) portfolio weights
+        shocks: (sims, days) standard normal draws, one row per path
+
+    Returns:
+        float64 array of terminal values per path, starting from 1.0
+    """
+    k = mu.shape[0]
+    sims, days = shocks.shape
+    drift = 0.0
+    var = 0.0
+    for b in range(k):
+        drift += w[b] * mu[b]
+        lw = 0.0
+        for a in range(k):
+            lw += w[a] * L[a, b]
+        var += lw * lw
+    sigma = np.sqrt(var)
+
+    out = np.empty(sims)
+    for s in prange(sims):
+        z = 0.0
+        for t in range(days):
+            z += shocks[s, t]
+        out[s] = np.exp(days * drift + sigma * z)
+    return out
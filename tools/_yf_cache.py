@@ -0,0 +1,86 @@
+"""
+Disk + in-process cache for yfinance history downloads.
+Only closed historical ranges are cached; anything touching today goes to the network.
+"""
+
+import datetime
+import functools
+import hashlib
+import logging
+import os
+from typing import Optional
+
+import pandas as pd
+import yfinance as yf
+
+from config import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+
+def _is_historical(end: Optional[str]) -> bool:
+    """True when the range ends before today, so the bars can no longer change."""
+    if end is None:
+        return False
+    return pd.Timestamp(end).date() < datetime.date.today()
+
+
+def _cache_path(key: tuple):
+    digest = hashlib.sha1(repr(key).encode()).hexdigest()
+    return CACHE_DIR / f"{digest}.pkl"
+
+
+def _download(symbol: str, period: Optional[str], interval: str, start: Optional[str], end: Optional[str]) -> pd.DataFrame:
+    if start is not None or end is not None:
+        return yf.Ticker(symbol).history(start=start, end=end, interval=interval)
+    return yf.Ticker(symbol).history(period=period, interval=interval)
+
+
+@functools.lru_cache(maxsize=64)
+def _load_historical(symbol: str, interval: str, start: Optional[str], end: str) -> pd.DataFrame:
+    path = _cache_path((symbol, start, end, interval))
+    try:
+        return pd.read_pickle(path)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning("Discarding unreadable cache file %s: %s", path, e)
+
+    df = _download(symbol, None, interval, start, end)
+    if df.empty:
+        # Don't pin a transient failure for the rest of the session
+        raise LookupError(f"No data for {symbol}")
+
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        df.to_pickle(tmp)
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.warning("Could not write price cache for %s: %s", symbol, e)
+    return df
+
+
+def cached_history(
+    symbol: str,
+    period: Optional[str] = None,
+    interval: str = "1d",
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Drop-in for ``yf.Ticker(symbol).history(...)`` that caches closed ranges.
+
+    Ranges with an explicit ``end`` before today are served from memory, then
+    from a pickle under CACHE_DIR, and only downloaded on a miss. Relative
+    ``period`` queries and ranges reaching today always hit the network.
+
+    Returns:
+        A fresh DataFrame the caller is free to mutate
+    """
+    if period is None and _is_historical(end):
+        try:
+            return _load_historical(symbol, interval, start, end).copy()
+        except LookupError:
+            return pd.DataFrame()
+    return _download(symbol, period, interval, start, end)
@@ -3,6 +3,10 @@ Alpaca Paper Trading Broker Integration
 Provides a clean interface to Alpaca's paper trading API for MonteWalk.
 """
 
+import copy
+import functools
+from operator import attrgetter
+import numpy as np
 from typing import Dict, Any, List, Optional, Literal
 from alpaca.trading.client import TradingClient
 from alpaca.trading.requests import (
@@ -12,14 +16,127 @@ from alpaca.trading.requests import (
 )
 from alpaca.trading.enums import OrderSide, TimeInForce, QueryOrderStatus, OrderClass
 from alpaca.data.historical import StockHistoricalDataClient
-from alpaca.data.requests import StockBarsRequest
+from alpaca.data.requests import StockBarsRequest, StockLatestTradeRequest
 from alpaca.data.timeframe import TimeFrame
 from config import ALPACA_API_KEY, ALPACA_SECRET_KEY, ALPACA_PAPER_TRADING
 import logging
 import os
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json via requests is used otherwise
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+_STATUS_MAP = {
+    "all": QueryOrderStatus.ALL,
+    "open": QueryOrderStatus.OPEN,
+    "closed": QueryOrderStatus.CLOSED
+}
+
+_SIDE_MAP = {
+    "buy": OrderSide.BUY,
+    "sell": OrderSide.SELL
+}
+
+
+def _order_side(side: str) -> OrderSide:
+    """Translate a 'buy'/'sell' string (any case) to OrderSide, rejecting anything else."""
+    try:
+        return _SIDE_MAP[side.lower()]
+    except (KeyError, AttributeError):
+        raise ValueError(f"Invalid order side: {side!r} (expected 'buy' or 'sell')") from None
+
+
+# Enum -> raw value without going through the Enum.value descriptor
+_enum_str = attrgetter("_value_")
+
+
+def _iso(dt) -> Optional[str]:
+    """ISO-8601 string for an optional datetime."""
+    return dt.isoformat() if dt else None
+
+
+# Numeric position fields, converted to float in one pass per position
+_POS_FIELDS = ("qty", "avg_entry_price", "current_price", "market_value", "unrealized_pl", "unrealized_plpc")
+_pos_getter = attrgetter(*_POS_FIELDS)
+
+
+def _position_to_dict(pos) -> Dict[str, Any]:
+    """Convert an Alpaca Position object into a plain dict."""
+    details = dict(zip(_POS_FIELDS, map(float, _pos_getter(pos))))
+    details["side"] = pos.side
+    return details
+
+
+def _position_columns(positions: List[Any]) -> Dict[str, np.ndarray]:
+    """Convert each numeric position field to a float64 array in one NumPy pass."""
+    n = len(positions)
+    return {
+        field: np.fromiter((getattr(p, field) for p in positions), dtype=np.float64, count=n)
+        for field in _POS_FIELDS
+    }
+
+
+def _orjson_body(response: requests.Response, **kwargs) -> Any:
+    """Drop-in for Response.json() that decodes the body with orjson."""
+    return orjson.loads(response.content)
+
+
+class _FastJSONAdapter(HTTPAdapter):
+    """HTTPAdapter whose responses decode JSON with orjson when it is installed."""
+    
+    def build_response(self, req, resp):
+        response = super().build_response(req, resp)
+        if orjson is not None:
+            response.json = functools.partial(_orjson_body, response)
+        return response
+
+
+def _pooled_session() -> requests.Session:
+    """Create a keep-alive HTTP session sized for concurrent broker calls."""
+    session = requests.Session()
+    adapter = _FastJSONAdapter(pool_connections=20, pool_maxsize=50)
+    session.mount("https://", adapter)
+    return session
+
+
+def _share_session(client: Any, session: requests.Session) -> None:
+    """Point an alpaca-py REST client at a shared session (no-op if the SDK changes)."""
+    if hasattr(client, "_session"):
+        client._session = session
+
+
+# Seconds a cached account/positions read stays fresh. Keeps back-to-back
+# prompt renders from re-hitting the REST API for the same snapshot.
+_CACHE_TTL = 2.0
+
+
+def _ttl_cached(method):
+    """
+    Cache a no-argument broker read for _CACHE_TTL seconds.
+    
+    Callers get their own copy, so mutating a result can't leak into later reads.
+    The values are nested (per-position dicts, column arrays), hence deepcopy.
+    """
+    key = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self):
+        now = time.monotonic()
+        hit = self._cache.get(key)
+        if hit is not None and now - hit[0] < _CACHE_TTL:
+            return copy.deepcopy(hit[1])
+        result = method(self)
+        self._cache[key] = (now, result)
+        return copy.deepcopy(result)
+    return wrapper
+
 
 class AlpacaBroker:
     """
@@ -27,30 +144,54 @@ class AlpacaBroker:
     Handles all broker interactions for MonteWalk.
     """
     
+    __slots__ = ("trading_client", "data_client", "_cache", "_verified")
+    
     def __init__(self):
         """Initialize Alpaca trading and data clients."""
+        self._cache: Dict[str, Any] = {}
         if not ALPACA_API_KEY or not ALPACA_SECRET_KEY:
             logger.error("Alpaca API credentials missing in environment variables.")
             raise ValueError("Alpaca API credentials not found in environment variables.")
         
+        session = _pooled_session()
+        
         try:
             self.trading_client = TradingClient(
                 ALPACA_API_KEY, 
                 ALPACA_SECRET_KEY, 
                 paper=ALPACA_PAPER_TRADING
             )
-            account = self.trading_client.get_account()
-            logger.info(f"Alpaca Broker initialized. Account Status: {account.status}, Buying Power: ${account.buying_power}")
+            _share_session(self.trading_client, session)
         except Exception as e:
-            logger.critical(f"Failed to connect to Alpaca API: {e}")
+            logger.critical("Failed to connect to Alpaca API: %s", e)
             raise ConnectionError(f"Failed to connect to Alpaca: {e}")
 
         self.data_client = StockHistoricalDataClient(
             ALPACA_API_KEY, 
             ALPACA_SECRET_KEY
         )
+        _share_session(self.data_client, session)
         logger.info("Alpaca broker initialized (Paper Trading Mode)")
+        
+        # Check the credentials off the import path; real calls fail loudly anyway
+        self._verified: Optional[bool] = None
+        threading.Thread(target=self._verify_connection, name="alpaca-verify", daemon=True).start()
+    
+    def _verify_connection(self) -> None:
+        """Sanity-check the account once in the background and log the outcome."""
+        try:
+            account = self.trading_client.get_account()
+            self._verified = True
+            logger.info("Alpaca Broker connected. Account Status: %s, Buying Power: $%s", account.status, account.buying_power)
+        except Exception as e:
+            self._verified = False
+            logger.critical("Failed to connect to Alpaca API: %s", e)
     
+    def invalidate_cache(self) -> None:
+        """Drop cached account/position reads (called after any order activity)."""
+        self._cache.clear()
+    
+    @_ttl_cached
     def get_account(self) -> Dict[str, Any]:
         """
         Retrieve account information.
@@ -69,9 +210,10 @@ class AlpacaBroker:
                 "daytrade_count": account.daytrade_count
             }
         except Exception as e:
-            logger.error(f"Failed to get account: {e}")
+            logger.error("Failed to get account: %s", e)
             raise
     
+    @_ttl_cached
     def get_all_positions(self) -> Dict[str, Any]:
         """
         Retrieve all open positions.
@@ -81,20 +223,29 @@ class AlpacaBroker:
         """
         try:
             positions = self.trading_client.get_all_positions()
-            result = {}
-            for pos in positions:
-                result[pos.symbol] = {
-                    "qty": float(pos.qty),
-                    "avg_entry_price": float(pos.avg_entry_price),
-                    "current_price": float(pos.current_price),
-                    "market_value": float(pos.market_value),
-                    "unrealized_pl": float(pos.unrealized_pl),
-                    "unrealized_plpc": float(pos.unrealized_plpc),
-                    "side": pos.side
-                }
-            return result
+            return {pos.symbol: _position_to_dict(pos) for pos in positions}
         except Exception as e:
-            logger.error(f"Failed to get positions: {e}")
+            logger.error("Failed to get positions: %s", e)
+            raise
+    
+    @_ttl_cached
+    def get_positions_soa(self) -> Dict[str, np.ndarray]:
+        """
+        Retrieve all open positions as column arrays (one array per field).
+        
+        Suited to vectorized analytics, e.g. ``cols["qty"] * cols["current_price"]``.
+        
+        Returns:
+            Dict with "symbol" and "side" object arrays plus a float64 array per numeric field
+        """
+        try:
+            positions = list(self.trading_client.get_all_positions())
+            columns = _position_columns(positions)
+            columns["symbol"] = np.array([p.symbol for p in positions], dtype=object)
+            columns["side"] = np.array([p.side for p in positions], dtype=object)
+            return columns
+        except Exception as e:
+            logger.error("Failed to get positions: %s", e)
             raise
     
     def get_position(self, symbol: str) -> Optional[Dict[str, Any]]:
@@ -109,19 +260,29 @@ class AlpacaBroker:
         """
         try:
             pos = self.trading_client.get_open_position(symbol)
-            return {
-                "qty": float(pos.qty),
-                "avg_entry_price": float(pos.avg_entry_price),
-                "current_price": float(pos.current_price),
-                "market_value": float(pos.market_value),
-                "unrealized_pl": float(pos.unrealized_pl),
-                "unrealized_plpc": float(pos.unrealized_plpc),
-                "side": pos.side
-            }
+            return _position_to_dict(pos)
         except Exception as e:
-            logger.debug(f"No position for {symbol}: {e}")
+            logger.debug("No position for %s: %s", symbol, e)
             return None
     
+    def get_latest_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """
+        Get the latest trade price for several symbols in one request.
+        
+        Args:
+            symbols: Ticker symbols
+            
+        Returns:
+            Dict mapping symbol -> last trade price (symbols Alpaca has no data for are omitted)
+        """
+        try:
+            request = StockLatestTradeRequest(symbol_or_symbols=[s.upper() for s in symbols])
+            trades = self.data_client.get_stock_latest_trade(request)
+            return {symbol: float(trade.price) for symbol, trade in trades.items()}
+        except Exception as e:
+            logger.error("Failed to get latest prices: %s", e)
+            raise
+    
     def submit_market_order(
         self, 
         symbol: str, 
@@ -140,7 +301,7 @@ class AlpacaBroker:
             Order confirmation dict
         """
         try:
-            order_side = OrderSide.BUY if side.lower() == "buy" else OrderSide.SELL
+            order_side = _order_side(side)
             
             request = MarketOrderRequest(
                 symbol=symbol.upper(),
@@ -150,20 +311,21 @@ class AlpacaBroker:
             )
             
             order = self.trading_client.submit_order(request)
+            self.invalidate_cache()
             
-            logger.info(f"Market order submitted: {side.upper()} {qty} {symbol}")
+            logger.info("Market order submitted: %s %s %s", side.upper(), qty, symbol)
             
             return {
                 "order_id": str(order.id),
                 "symbol": order.symbol,
                 "qty": float(order.qty),
-                "side": order.side.value,
-                "type": order.type.value,
-                "status": order.status.value,
-                "submitted_at": str(order.submitted_at)
+                "side": _enum_str(order.side),
+                "type": _enum_str(order.type),
+                "status": _enum_str(order.status),
+                "submitted_at": _iso(order.submitted_at)
             }
         except Exception as e:
-            logger.error(f"Market order failed: {e}")
+            logger.error("Market order failed: %s", e)
             raise
     
     def submit_limit_order(
@@ -186,7 +348,7 @@ class AlpacaBroker:
             Order confirmation dict
         """
         try:
-            order_side = OrderSide.BUY if side.lower() == "buy" else OrderSide.SELL
+            order_side = _order_side(side)
             
             request = LimitOrderRequest(
                 symbol=symbol.upper(),
@@ -197,21 +359,22 @@ class AlpacaBroker:
             )
             
             order = self.trading_client.submit_order(request)
+            self.invalidate_cache()
             
-            logger.info(f"Limit order submitted: {side.upper()} {qty} {symbol} @ {limit_price}")
+            logger.info("Limit order submitted: %s %s %s @ %s", side.upper(), qty, symbol, limit_price)
             
             return {
                 "order_id": str(order.id),
                 "symbol": order.symbol,
                 "qty": float(order.qty),
-                "side": order.side.value,
-                "type": order.type.value,
+                "side": _enum_str(order.side),
+                "type": _enum_str(order.type),
                 "limit_price": float(order.limit_price) if order.limit_price else None,
-                "status": order.status.value,
-                "submitted_at": str(order.submitted_at)
+                "status": _enum_str(order.status),
+                "submitted_at": _iso(order.submitted_at)
             }
         except Exception as e:
-            logger.error(f"Limit order failed: {e}")
+            logger.error("Limit order failed: %s", e)
             raise
     
     def get_orders(self, status: str = "all") -> List[Dict[str, Any]]:
@@ -225,14 +388,8 @@ class AlpacaBroker:
             List of order dicts
         """
         try:
-            status_map = {
-                "all": QueryOrderStatus.ALL,
-                "open": QueryOrderStatus.OPEN,
-                "closed": QueryOrderStatus.CLOSED
-            }
-            
             request = GetOrdersRequest(
-                status=status_map.get(status.lower(), QueryOrderStatus.ALL)
+                status=_STATUS_MAP.get(status.lower(), QueryOrderStatus.ALL)
             )
             
             orders = self.trading_client.get_orders(request)
@@ -243,17 +400,17 @@ class AlpacaBroker:
                     "order_id": str(order.id),
                     "symbol": order.symbol,
                     "qty": float(order.qty),
-                    "side": order.side.value,
-                    "type": order.type.value,
-                    "status": order.status.value,
+                    "side": _enum_str(order.side),
+                    "type": _enum_str(order.type),
+                    "status": _enum_str(order.status),
                     "filled_qty": float(order.filled_qty) if order.filled_qty else 0,
                     "filled_avg_price": float(order.filled_avg_price) if order.filled_avg_price else None,
-                    "submitted_at": str(order.submitted_at)
+                    "submitted_at": _iso(order.submitted_at)
                 })
             
             return result
         except Exception as e:
-            logger.error(f"Failed to get orders: {e}")
+            logger.error("Failed to get orders: %s", e)
             raise
     
     def cancel_order(self, order_id: str) -> bool:
@@ -268,10 +425,11 @@ class AlpacaBroker:
         """
         try:
             self.trading_client.cancel_order_by_id(order_id)
-            logger.info(f"Order {order_id} cancelled")
+            self.invalidate_cache()
+            logger.info("Order %s cancelled", order_id)
             return True
         except Exception as e:
-            logger.error(f"Failed to cancel order {order_id}: {e}")
+            logger.error("Failed to cancel order %s: %s", order_id, e)
             raise
     
     def close_all_positions(self) -> Dict[str, Any]:
@@ -283,7 +441,8 @@ class AlpacaBroker:
         """
         try:
             closed = self.trading_client.close_all_positions(cancel_orders=True)
-            logger.info(f"Closed {len(closed)} positions")
+            self.invalidate_cache()
+            logger.info("Closed %s positions", len(closed))
             
             return {
                 "closed_count": len(closed),
@@ -291,13 +450,13 @@ class AlpacaBroker:
                     {
                         "symbol": pos.symbol,
                         "qty": float(pos.qty) if pos.qty else 0,
-                        "status": pos.status.value
+                        "status": _enum_str(pos.status)
                     }
                     for pos in closed
                 ]
             }
         except Exception as e:
-            logger.error(f"Failed to close all positions: {e}")
+            logger.error("Failed to close all positions: %s", e)
             raise
     
     def close_position(self, symbol: str) -> Dict[str, Any]:
@@ -312,26 +471,26 @@ class AlpacaBroker:
         """
         try:
             order = self.trading_client.close_position(symbol)
-            logger.info(f"Closed position: {symbol}")
+            self.invalidate_cache()
+            logger.info("Closed position: %s", symbol)
             
             return {
                 "order_id": str(order.id),
                 "symbol": order.symbol,
                 "qty": float(order.qty),
-                "side": order.side.value,
-                "status": order.status.value
+                "side": _enum_str(order.side),
+                "status": _enum_str(order.status)
             }
         except Exception as e:
-            logger.error(f"Failed to close position {symbol}: {e}")
+            logger.error("Failed to close position %s: %s", symbol, e)
             raise
 
 
-# Singleton instance
-_broker = None
-
+@functools.lru_cache(maxsize=1)
 def get_broker() -> AlpacaBroker:
-    """Get or create the Alpaca broker singleton."""
-    global _broker
-    if _broker is None:
-        _broker = AlpacaBroker()
-    return _broker
+    """
+    Get or create the Alpaca broker singleton.
+    
+    Failed constructions are not cached, so a later call retries.
+    """
+    return AlpacaBroker()
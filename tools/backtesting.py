@@ -1,11 +1,11 @@
 import pandas as pd
-import pandas_ta as ta
-import yfinance as yf
 import numpy as np
 import logging
 import json
 from typing import Dict, Any, List, Tuple, Optional
 from pycoingecko import CoinGeckoAPI
+from tools._yf_cache import cached_history
+from tools._kernels import ma_crossover_backtest, walk_forward_windows
 
 logger = logging.getLogger(__name__)
 cg = CoinGeckoAPI()
@@ -13,6 +13,17 @@ cg = CoinGeckoAPI()
 # Common crypto symbol mappings (can be extended)
 COMMON_CRYPTO_SYMBOLS = {'BTC', 'ETH', 'SHIB', 'SOL', 'XRP', 'ADA', 'DOGE', 'USDC', 'USDT'}
 
+# Walk-forward parameter grid, built once: the valid (fast < slow) pairs, the
+# distinct MA windows, and each pair's fast/slow index into those windows
+_WF_FAST_PARAMS = [10, 20, 50]
+_WF_SLOW_PARAMS = [50, 100, 200]
+_WF_PAIRS = [(f, s) for f in _WF_FAST_PARAMS for s in _WF_SLOW_PARAMS if f < s]
+_WF_WINDOWS = np.array(sorted({*_WF_FAST_PARAMS, *_WF_SLOW_PARAMS}), dtype=np.int64)
+_k2i = {int(k): i for i, k in enumerate(_WF_WINDOWS)}
+_WF_PAIR_FAST = np.array([_k2i[f] for f, _ in _WF_PAIRS], dtype=np.int64)
+_WF_PAIR_SLOW = np.array([_k2i[s] for _, s in _WF_PAIRS], dtype=np.int64)
+del _k2i
+
 def _get_coingecko_id(symbol: str) -> Optional[str]:
     """
     Dynamically search for CoinGecko ID using the search API.
@@ -42,7 +53,7 @@ def _get_coingecko_id(symbol: str) -> Optional[str]:
         if results.get('coins'):
             return results['coins'][0]['id']
     except Exception as e:
-        logger.debug(f"CoinGecko search failed for {symbol}: {e}")
+        logger.debug("CoinGecko search failed for %s: %s", symbol, e)
     
     return None
 
@@ -52,22 +63,23 @@ def _fetch_crypto_data(coin_id: str, start: str, end: str):
         data = cg.get_coin_market_chart_range_by_id(
             id=coin_id,
             vs_currency='usd',
-            from_timestamp=int(pd.to_datetime(start).timestamp()),
-            to_timestamp=int(pd.to_datetime(end).timestamp())
+            from_timestamp=int(pd.Timestamp(start).timestamp()),
+            to_timestamp=int(pd.Timestamp(end).timestamp())
         )
         
-        prices = data['prices']
+        # [[ms, value], ...] -> (N, 2) arrays; dates convert in one vectorized call
+        prices = np.asarray(data['prices'], dtype=np.float64).reshape(-1, 2)
         volumes = data['total_volumes']
         
         df = pd.DataFrame({
-            'Date': pd.to_datetime([p[0] for p in prices], unit='ms'),
-            'Close': [p[1] for p in prices],
-            'Volume': [v[1] for v in volumes] if volumes else [0] * len(prices)
+            'Date': pd.to_datetime(prices[:, 0].astype(np.int64), unit='ms'),
+            'Close': prices[:, 1],
+            'Volume': np.asarray(volumes, dtype=np.float64).reshape(-1, 2)[:, 1] if volumes else np.zeros(len(prices))
         })
         df.set_index('Date', inplace=True)
         return df
     except Exception as e:
-        logger.error(f"Failed to fetch crypto data for {coin_id}: {e}")
+        logger.error("Failed to fetch crypto data for %s: %s", coin_id, e)
         return pd.DataFrame()
 
 def _fetch_data(symbol: str, start: str, end: str):
@@ -75,12 +87,32 @@ def _fetch_data(symbol: str, start: str, end: str):
     # Try to find CoinGecko ID
     coin_id = _get_coingecko_id(symbol)
     if coin_id:
-        logger.info(f"Recognized {symbol} as crypto (CoinGecko ID: {coin_id})")
+        logger.info("Recognized %s as crypto (CoinGecko ID: %s)", symbol, coin_id)
         return _fetch_crypto_data(coin_id, start, end)
     else:
         # Fall back to stock data
-        logger.info(f"Treating {symbol} as stock symbol")
-        return yf.download(symbol, start=start, end=end, progress=False)
+        logger.info("Treating %s as stock symbol", symbol)
+        return cached_history(symbol, start=start, end=end)
+
+def _fetch_closes(symbol: str, start: str, end: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Closing prices as a contiguous float64 array plus matching datetime64[D]
+    dates (exchange-local), for the numeric kernels. Both are empty when no data.
+    """
+    df = _fetch_data(symbol, start, end)
+    if df.empty:
+        return np.empty(0), np.empty(0, dtype="datetime64[D]")
+    
+    close = df['Close']
+    if isinstance(close, pd.DataFrame):
+        close = close.iloc[:, 0]
+    # Missing bars would poison every running product and sum downstream
+    # (and the kernels are built with fastmath, which assumes finite input)
+    close = close[np.isfinite(close.to_numpy(dtype=np.float64))]
+    index = close.index
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return np.ascontiguousarray(close.to_numpy(dtype=np.float64)), index.to_numpy(dtype="datetime64[D]")
 
 def run_backtest(symbol: str, fast_ma: int, slow_ma: int, start_date: str = "2020-01-01", end_date: str = "2023-12-31", visualize: bool = False) -> str:
     """
@@ -95,43 +127,18 @@ def run_backtest(symbol: str, fast_ma: int, slow_ma: int, start_date: str = "202
         visualize: If True, returns equity curve chart
     """
     try:
-        logger.info(f"Starting backtest for {symbol} (Fast: {fast_ma}, Slow: {slow_ma}) from {start_date} to {end_date}")
+        logger.info("Starting backtest for %s (Fast: %s, Slow: %s) from %s to %s", symbol, fast_ma, slow_ma, start_date, end_date)
         # Use yfinance directly instead of get_price
-        df = _fetch_data(symbol, start_date, end_date)
+        close, _ = _fetch_closes(symbol, start_date, end_date)
         
-        if df.empty:
-            logger.warning(f"Backtest failed: No data for {symbol}")
+        if close.size == 0:
+            logger.warning("Backtest failed: No data for %s", symbol)
             return f"No data found for {symbol}"
-            
-        # Strategy Logic
-        df['Fast_MA'] = ta.sma(df['Close'], length=fast_ma)
-        df['Slow_MA'] = ta.sma(df['Close'], length=slow_ma)
-        
-        # Signals
-        df['Signal'] = 0
-        df.loc[df['Fast_MA'] > df['Slow_MA'], 'Signal'] = 1
-        df['Position'] = df['Signal'].diff()
-        
-        # Calculate Returns
-        df['Market_Return'] = df['Close'].pct_change()
-        df['Strategy_Return'] = df['Market_Return'] * df['Signal'].shift(1)
-        
-        # Equity Curves
-        df['Strategy_Equity'] = (1 + df['Strategy_Return']).cumprod()
-        df['BuyHold_Equity'] = (1 + df['Market_Return']).cumprod()
-        
-        # Metrics
-        total_return = (1 + df['Strategy_Return']).prod() - 1
-        buy_hold_return = (1 + df['Market_Return']).prod() - 1
-        
-        # Max Drawdown
-        cum_ret = (1 + df['Strategy_Return']).cumprod()
-        peak = cum_ret.expanding(min_periods=1).max()
-        dd = (cum_ret / peak) - 1
-        max_dd = dd.min()
-        
-        # Sharpe Ratio (assuming 0% risk free for simplicity or use config)
-        sharpe = df['Strategy_Return'].mean() / df['Strategy_Return'].std() * np.sqrt(252)
+
+        # SMA signals, returns, equity curves and metrics in one fused pass
+        strategy_equity, buyhold_equity, sharpe, max_dd = ma_crossover_backtest(close, fast_ma, slow_ma)
+        total_return = strategy_equity[-1] - 1
+        buy_hold_return = buyhold_equity[-1] - 1
         
         result = (
             f"Backtest Results for {symbol} ({start_date} to {end_date}):\n"
@@ -146,11 +153,11 @@ def run_backtest(symbol: str, fast_ma: int, slow_ma: int, start_date: str = "202
         if visualize:
             try:
                 from tools.visualizer import plot_line
-                df_clean = df.dropna(subset=['Strategy_Equity', 'BuyHold_Equity'])
+                # Skip the first bar, which has no return yet
                 chart = plot_line(
                     {
-                        'x': list(range(len(df_clean))),
-                        'y': [df_clean['Strategy_Equity'].tolist(), df_clean['BuyHold_Equity'].tolist()]
+                        'x': list(range(len(strategy_equity) - 1)),
+                        'y': [strategy_equity[1:].tolist(), buyhold_equity[1:].tolist()]
                     },
                     x_label="Days",
                     y_label="Equity (Initial = $1)",
@@ -159,14 +166,14 @@ def run_backtest(symbol: str, fast_ma: int, slow_ma: int, start_date: str = "202
                 )
                 result += f"\n\n{chart}"
             except Exception as e:
-                logger.error(f"Error generating backtest chart: {e}")
+                logger.error("Error generating backtest chart: %s", e)
                 result += f"\n(Visualization error: {str(e)})"
         
-        logger.info(f"Backtest completed for {symbol}. Return: {total_return:.2%}")
+        logger.info("Backtest completed for %s. Return: %.2f%%", symbol, total_return * 100)
         return result
 
     except Exception as e:
-        logger.error(f"Backtest failed for {symbol}: {e}", exc_info=True)
+        logger.error("Backtest failed for %s: %s", symbol, e, exc_info=True)
         return f"Error running backtest: {str(e)}"
 
 def walk_forward_analysis(symbol: str, start_date: str = "2020-01-01", end_date: str = "2023-12-31", train_months: int = 12, test_months: int = 3) -> str:
@@ -174,13 +181,9 @@ def walk_forward_analysis(symbol: str, start_date: str = "2020-01-01", end_date:
     Performs Walk Forward Analysis on MA Crossover.
     Optimizes (Fast, Slow) on Train, tests on Test.
     """
-    df = _fetch_data(symbol, start_date, end_date)
-    if df.empty:
+    close, dates = _fetch_closes(symbol, start_date, end_date)
+    if close.size == 0:
         return "No data found."
-    
-    close = df['Close']
-    if isinstance(close, pd.DataFrame):
-        close = close.iloc[:, 0]
         
     # Generate windows
     # Simplified: Iterate by index assuming daily data
@@ -191,49 +194,19 @@ def walk_forward_analysis(symbol: str, start_date: str = "2020-01-01", end_date:
     
     results = []
     
-    # Parameter Grid
-    fast_params = [10, 20, 50]
-    slow_params = [50, 100, 200]
+    starts = np.arange(0, len(close) - train_len - test_len, step, dtype=np.int64)
+    best_pair, test_returns = walk_forward_windows(
+        close, starts, train_len, test_len, _WF_WINDOWS, _WF_PAIR_FAST, _WF_PAIR_SLOW
+    )
     
-    current_idx = 0
-    while current_idx + train_len + test_len < len(df):
-        train_data = close.iloc[current_idx : current_idx + train_len]
-        test_data = close.iloc[current_idx + train_len : current_idx + train_len + test_len]
-        
-        # Optimize on Train
-        best_perf = -np.inf
-        best_params = (0, 0)
-        
-        for f in fast_params:
-            for s in slow_params:
-                if f >= s: continue
-                # Vectorized backtest on train
-                fast_ma = train_data.rolling(window=f).mean()
-                slow_ma = train_data.rolling(window=s).mean()
-                signal = (fast_ma > slow_ma).astype(int).shift(1)
-                ret = train_data.pct_change() * signal
-                perf = ret.sum() # Simple sum of returns
-                
-                if perf > best_perf:
-                    best_perf = perf
-                    best_params = (f, s)
-        
-        # Test on Test Data
-        f, s = best_params
-        fast_ma_test = test_data.rolling(window=f).mean()
-        slow_ma_test = test_data.rolling(window=s).mean()
-        signal_test = (fast_ma_test > slow_ma_test).astype(int).shift(1)
-        ret_test = test_data.pct_change() * signal_test
-        test_perf = ret_test.sum()
-        
+    for start, q, test_perf in zip(starts, best_pair, test_returns):
+        test_start = start + train_len
         results.append({
-            "Period": f"{test_data.index[0].date()} to {test_data.index[-1].date()}",
-            "Best Params": best_params,
-            "Test Return": test_perf
+            "Period": f"{dates[test_start]} to {dates[test_start + test_len - 1]}",
+            "Best Params": _WF_PAIRS[q],
+            "Test Return": float(test_perf)
         })
         
-        current_idx += step
-        
     # Format Output
     output = ["Walk Forward Analysis Results:"]
     total_ret = 0
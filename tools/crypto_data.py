@@ -45,7 +45,7 @@ def get_crypto_price(coin_id: str, vs_currency: str = "usd") -> Dict[str, Any]:
             "currency": vs_currency.upper()
         }
     except Exception as e:
-        logger.error(f"CoinGecko error for {coin_id}: {e}")
+        logger.error("CoinGecko error for %s: %s", coin_id, e)
         return {"error": str(e)}
 
 def get_crypto_market_data(coin_id: str) -> str:
@@ -88,7 +88,7 @@ All-Time Low: ${market.get('atl', {}).get('usd', 0):,.2f}
 ATL Date: {market.get('atl_date', {}).get('usd', 'N/A')[:10]}
 """
     except Exception as e:
-        logger.error(f"CoinGecko error for {coin_id}: {e}")
+        logger.error("CoinGecko error for %s: %s", coin_id, e)
         return f"Error fetching market data for {coin_id}: {str(e)}"
 
 def get_trending_crypto() -> str:
@@ -116,7 +116,7 @@ def get_trending_crypto() -> str:
             
         return "\n".join(summary)
     except Exception as e:
-        logger.error(f"CoinGecko error: {e}")
+        logger.error("CoinGecko error: %s", e)
         return f"Error fetching trending coins: {str(e)}"
 
 def search_crypto(query: str) -> str:
@@ -147,5 +147,5 @@ def search_crypto(query: str) -> str:
         summary.append("\nUse the 'id' with get_crypto_market_data() for detailed info")
         return "\n".join(summary)
     except Exception as e:
-        logger.error(f"CoinGecko search error: {e}")
+        logger.error("CoinGecko search error: %s", e)
         return f"Error searching for '{query}': {str(e)}"
@@ -1,5 +1,6 @@
+import time
 import yfinance as yf
-from typing import Any, Optional, Literal
+from typing import Any, Dict, Optional, Literal, Tuple
 from tools.alpaca_broker import get_broker
 import logging
 
@@ -10,10 +11,27 @@ try:
     broker = get_broker()
     logger.info("Execution module using Alpaca broker")
 except Exception as e:
-    logger.error(f"Failed to initialize Alpaca broker: {e}")
+    logger.error("Failed to initialize Alpaca broker: %s", e)
     broker = None
 
 
+# Last prices used for pre-trade risk checks, keyed by symbol: (fetched_at, price)
+_PRICE_TTL = 5.0
+_price_cache: Dict[str, Tuple[float, float]] = {}
+
+
+def _last_price(symbol: str) -> Optional[float]:
+    """Last trade price for risk validation, reused for _PRICE_TTL seconds."""
+    now = time.monotonic()
+    hit = _price_cache.get(symbol)
+    if hit is not None and now - hit[0] < _PRICE_TTL:
+        return hit[1]
+    price = yf.Ticker(symbol).fast_info.last_price
+    if price is not None:
+        _price_cache[symbol] = (now, price)
+    return price
+
+
 class OrderResult:
     """Simple order result wrapper for API compatibility."""
     def __init__(self, order_dict: dict[str, Any]):
@@ -80,7 +98,7 @@ def get_positions() -> dict[str, Any]:
             "positions": positions
         }
     except Exception as e:
-        logger.error(f"Failed to get positions: {e}")
+        logger.error("Failed to get positions: %s", e)
         return {
             "error": str(e),
             "cash": 0,
@@ -115,10 +133,9 @@ def place_order(
     from tools.risk_engine import validate_trade
     
     try:
-        # Get current price for risk validation
-        ticker = yf.Ticker(symbol)
+        # Get current price for risk validation (reused for _PRICE_TTL seconds)
         try:
-            current_price = ticker.fast_info.last_price
+            current_price = _last_price(symbol)
         except Exception:
             return f"Failed to get price for {symbol}"
         
@@ -128,14 +145,14 @@ def place_order(
         # Pre-Trade Risk Check
         risk_error = validate_trade(symbol, side, qty, current_price)
         if risk_error:
-            logger.warning(f"Trade rejected by risk engine: {risk_error}")
+            logger.warning("Trade rejected by risk engine: %s", risk_error)
             return risk_error
         
         # Submit order to Alpaca
         if order_type == "market":
-            logger.info(f"Submitting MARKET order: {side.upper()} {qty} {symbol}")
+            logger.info("Submitting MARKET order: %s %s %s", side.upper(), qty, symbol)
             order_result = broker.submit_market_order(symbol, side, qty)
-            logger.info(f"Order submitted successfully: ID={order_result['order_id']}")
+            logger.info("Order submitted successfully: ID=%s", order_result['order_id'])
             return OrderResult(order_result)
         
         elif order_type == "limit":
@@ -144,20 +161,20 @@ def place_order(
             
             # Validate limit price direction
             if side == "buy" and limit_price > current_price:
-                logger.warning(f"Buy limit {limit_price} is above market {current_price}")
+                logger.warning("Buy limit %s is above market %s", limit_price, current_price)
             if side == "sell" and limit_price < current_price:
-                logger.warning(f"Sell limit {limit_price} is below market {current_price}")
+                logger.warning("Sell limit %s is below market %s", limit_price, current_price)
             
-            logger.info(f"Submitting LIMIT order: {side.upper()} {qty} {symbol} @ ${limit_price}")
+            logger.info("Submitting LIMIT order: %s %s %s @ $%s", side.upper(), qty, symbol, limit_price)
             order_result = broker.submit_limit_order(symbol, side, qty, limit_price)
-            logger.info(f"Order submitted successfully: ID={order_result['order_id']}")
+            logger.info("Order submitted successfully: ID=%s", order_result['order_id'])
             return OrderResult(order_result)
         else:
-            logger.error(f"Unknown order type requested: {order_type}")
+            logger.error("Unknown order type requested: %s", order_type)
             return f"ERROR: Unknown order type: {order_type}"
             
     except Exception as e:
-        logger.error(f"Order failed: {e}", exc_info=True)
+        logger.error("Order failed: %s", e, exc_info=True)
         return f"ERROR: Order failed - {str(e)}"
 
 
@@ -175,12 +192,12 @@ def cancel_order(order_id: str) -> str:
         return "ERROR: Alpaca broker not initialized."
     
     try:
-        logger.info(f"Cancelling order: {order_id}")
+        logger.info("Cancelling order: %s", order_id)
         broker.cancel_order(order_id)
-        logger.info(f"Order {order_id} cancelled successfully")
+        logger.info("Order %s cancelled successfully", order_id)
         return f"✅ Order {order_id} cancelled successfully"
     except Exception as e:
-        logger.error(f"Cancel order failed: {e}", exc_info=True)
+        logger.error("Cancel order failed: %s", e, exc_info=True)
         return f"ERROR: Failed to cancel order - {str(e)}"
 
 
@@ -199,7 +216,7 @@ def flatten() -> list[dict[str, Any]]:
         result = broker.close_all_positions()
         return result.get('positions_closed', [])
     except Exception as e:
-        logger.error(f"Flatten failed: {e}")
+        logger.error("Flatten failed: %s", e)
         return []
 
 
@@ -221,5 +238,5 @@ def get_order_history(status: str = "all") -> list[Order]:
         orders = broker.get_orders(status)
         return [Order(order) for order in orders]
     except Exception as e:
-        logger.error(f"Get order history failed: {e}")
+        logger.error("Get order history failed: %s", e)
         return []
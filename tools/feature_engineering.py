@@ -1,6 +1,7 @@
+import numpy as np
 import pandas as pd
-import pandas_ta as ta
 import yfinance as yf
+from numpy.lib.stride_tricks import sliding_window_view
 from typing import List
 import logging
 
@@ -14,6 +15,8 @@ def compute_indicators(symbol: str, indicators: List[str] = ["RSI", "MACD"]) ->
         symbol: Ticker symbol.
         indicators: List of indicators (e.g., ['RSI', 'MACD', 'BBANDS']).
     """
+    import pandas_ta as ta  # heavy import, deferred to first use
+    
     df = yf.download(symbol, period="1y", progress=False)
     if df.empty:
         return f"No data for {symbol}"
@@ -48,17 +51,26 @@ def rolling_stats(symbol: str, window: int = 20) -> str:
     close = df['Close']
     if isinstance(close, pd.DataFrame): close = close.iloc[:, 0]
     
-    stats = pd.DataFrame()
-    stats['Mean'] = close.rolling(window=window).mean()
-    stats['Std'] = close.rolling(window=window).std()
+    # Only the last 10 rows are reported, so only reduce those windows
+    values = close.to_numpy(dtype=np.float64)
+    n_tail = min(10, len(values))
+    mean = np.full(n_tail, np.nan)
+    std = np.full(n_tail, np.nan)
+    if len(values) >= window:
+        windows = sliding_window_view(values, window)[-n_tail:]
+        mean[-len(windows):] = windows.mean(axis=-1)
+        std[-len(windows):] = windows.std(axis=-1, ddof=1)
     
-    return stats.tail(10).to_json(orient="index")
+    stats = pd.DataFrame({'Mean': mean, 'Std': std}, index=close.index[-n_tail:])
+    return stats.to_json(orient="index")
 
 def get_technical_summary(symbol: str) -> str:
     """
     Performs a technical analysis summary (RSI, MACD, Moving Averages).
     Returns a 'Buy', 'Sell', or 'Neutral' signal based on aggregated indicators.
     """
+    import pandas_ta as ta  # heavy import, deferred to first use
+    
     try:
         # Need enough data for 200 SMA
         df = yf.download(symbol, period="2y", progress=False)
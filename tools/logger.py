@@ -1,6 +1,9 @@
+import atexit
 import logging
 import sys
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from queue import SimpleQueue
 from config import LOG_FILE
 
 # Create a custom logger
@@ -17,8 +20,8 @@ def setup_logging():
         datefmt='%Y-%m-%d %H:%M:%S'
     )
 
-    # File Handler
-    file_handler = logging.FileHandler(LOG_FILE)
+    # File Handler (rotates at 10 MB, keeping 5 old files)
+    file_handler = RotatingFileHandler(LOG_FILE, maxBytes=10_000_000, backupCount=5)
     file_handler.setFormatter(formatter)
     file_handler.setLevel(logging.INFO)
 
@@ -33,8 +36,13 @@ def setup_logging():
     
     # Avoid adding duplicate handlers
     if not root_logger.handlers:
-        root_logger.addHandler(file_handler)
-        root_logger.addHandler(stream_handler)
+        # Callers only enqueue records; file and console writes happen on
+        # the listener's thread, off the order path
+        log_queue = SimpleQueue()
+        listener = QueueListener(log_queue, file_handler, stream_handler, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+        root_logger.addHandler(QueueHandler(log_queue))
     
     logger.info("Logging system initialized.")
 
@@ -48,5 +56,5 @@ def log_action(action_type: str, details: str) -> str:
     """
     # Clean up details to remove excessive newlines or emojis if needed
     clean_details = details.strip()
-    logger.info(f"[{action_type.upper()}] {clean_details}")
+    logger.info("[%s] %s", action_type.upper(), clean_details)
     return "Action logged successfully."
@@ -5,6 +5,7 @@ import pandas as pd
 import json
 import logging
 from typing import Dict, Any, Optional, List, Literal
+from tools._yf_cache import cached_history
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +24,16 @@ def retry(times=3, delay=1):
         return wrapper
     return decorator
 
+def _get_price_df(symbol: str, interval: str = "1d", period: str = "1y") -> pd.DataFrame:
+    """
+    OHLCV history as a DataFrame with a 'Date' column, for in-process callers.
+    Empty when no data is available.
+    """
+    history = cached_history(symbol, period=period, interval=interval)
+    if history.empty:
+        return history
+    return history.reset_index()
+
 @retry(times=3, delay=2)
 def get_price(
     symbol: str, 
@@ -43,16 +54,12 @@ def get_price(
         JSON string of OHLCV data or base64-encoded candlestick chart.
     """
     try:
-        ticker = yf.Ticker(symbol)
-        history = ticker.history(period=period, interval=interval)
+        history = _get_price_df(symbol, interval=interval, period=period)
         
         if history.empty:
-            logger.warning(f"No price data found for {symbol} (period={period}, interval={interval})")
+            logger.warning("No price data found for %s (period=%s, interval=%s)", symbol, period, interval)
             return json.dumps([])
         
-        # Reset index to make Date a column
-        history.reset_index(inplace=True)
-        
         if visualize:
             try:
                 from tools.visualizer import plot_candlestick
@@ -68,20 +75,19 @@ def get_price(
                 )
                 return chart
             except Exception as e:
-                logger.error(f"Error generating candlestick chart: {e}")
+                logger.error("Error generating candlestick chart: %s", e)
                 # Fall through to return data
         
+        logger.info("Fetched %s price records for %s", len(history), symbol)
+        
         # Convert to JSON-friendly format (list of dicts)
-        # Convert timestamps to string
+        # Convert timestamps to string, keeping the exchange offset
         history['Date'] = history['Date'].astype(str)
         
-        data = history.to_dict(orient="records")
-        logger.info(f"Fetched {len(data)} price records for {symbol}")
-        
-        return json.dumps(data, indent=2)
+        return json.dumps(history.to_dict(orient="records"), indent=2)
         
     except Exception as e:
-        logger.error(f"Error fetching price data for {symbol}: {e}")
+        logger.error("Error fetching price data for %s: %s", symbol, e)
         return json.dumps([])
 
 def get_fundamentals(symbol: str) -> Dict[str, Any]:
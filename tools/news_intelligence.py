@@ -3,17 +3,38 @@ News Intelligence & Sentiment Analysis Tools
 Uses yfinance for news headlines and FinBERT (Modal) for sentiment scoring.
 """
 
+import numpy as np
 import yfinance as yf
 from gnews import GNews
 from typing import Any
+import functools
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from tools.watchlist import _load_watchlist
 from newsapi import NewsApiClient
 from config import NEWSAPI_KEY, MODAL_ENDPOINT_URL
 import requests
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
+
+@functools.lru_cache(maxsize=None)
+def _gnews_client(max_results: int) -> GNews:
+    """One GNews per result size; sharing one and setting max_results per call would race across threads."""
+    return GNews(max_results=max_results)
+
+
+@functools.lru_cache(maxsize=1)
+def _newsapi_client() -> NewsApiClient:
+    """NewsAPI client on a pooled keep-alive session, built on first use."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return NewsApiClient(api_key=NEWSAPI_KEY, session=session)
+
+
 def get_news(symbol: str, max_items: int = 10) -> str:
     """
     Retrieves recent news headlines for a given symbol.
@@ -32,20 +53,20 @@ def get_news(symbol: str, max_items: int = 10) -> str:
         if not news:
             # Try NewsAPI first if available
             if NEWSAPI_KEY:
-                logger.info(f"yfinance news empty for {symbol}, trying NewsAPI")
+                logger.info("yfinance news empty for %s, trying NewsAPI", symbol)
                 newsapi_results = get_newsapi_articles(symbol, max_items)
                 if newsapi_results:
                     import json
                     return json.dumps(newsapi_results, indent=2)
             
             # Fallback to Google News
-            logger.info(f"Trying GNews fallback for {symbol}")
+            logger.info("Trying GNews fallback for %s", symbol)
             gnews_results = get_google_news(symbol, max_items)
             if gnews_results:
                 import json
                 return json.dumps(gnews_results, indent=2)
             
-            logger.warning(f"No news found for {symbol} from any source")
+            logger.warning("No news found for %s from any source", symbol)
             return f"No news found for {symbol}"
         
         # Limit results
@@ -72,12 +93,12 @@ def get_news(symbol: str, max_items: int = 10) -> str:
                 "link": link,
             })
         
-        logger.info(f"Fetched {len(results)} news items for {symbol} from yfinance")
+        logger.info("Fetched %s news items for %s from yfinance", len(results), symbol)
         import json
         return json.dumps(results, indent=2)
         
     except Exception as e:
-        logger.error(f"Error fetching news for {symbol}: {e}", exc_info=True)
+        logger.error("Error fetching news for %s: %s", symbol, e, exc_info=True)
         return f"Error fetching news for {symbol}: {str(e)}"
 
 
@@ -86,7 +107,7 @@ def get_google_news(symbol: str, max_items: int = 5) -> list[dict]:
     Fetches news from Google News via GNews library.
     """
     try:
-        google_news = GNews(max_results=max_items)
+        google_news = _gnews_client(max_items)
         # Search for the symbol
         results = google_news.get_news(symbol)
         
@@ -100,7 +121,7 @@ def get_google_news(symbol: str, max_items: int = 5) -> list[dict]:
             })
         return cleaned
     except Exception as e:
-        logger.error(f"GNews error for {symbol}: {e}")
+        logger.error("GNews error for %s: %s", symbol, e)
         return []
 
 
@@ -113,7 +134,7 @@ def get_newsapi_articles(symbol: str, max_items: int = 5) -> list[dict]:
         return []
         
     try:
-        newsapi = NewsApiClient(api_key=NEWSAPI_KEY)
+        newsapi = _newsapi_client()
         
         # Search for the symbol (NewsAPI works better with company names, but symbols can work)
         # We'll search in business category for relevance
@@ -136,7 +157,7 @@ def get_newsapi_articles(symbol: str, max_items: int = 5) -> list[dict]:
             })
         return cleaned
     except Exception as e:
-        logger.error(f"NewsAPI error for {symbol}: {e}")
+        logger.error("NewsAPI error for %s: %s", symbol, e)
         return []
 
 
@@ -181,7 +202,7 @@ def analyze_sentiment(text: str) -> dict[str, Any]:
         }
         
     except Exception as e:
-        logger.error(f"Modal FinBERT failed: {e}")
+        logger.error("Modal FinBERT failed: %s", e)
         return {"error": f"Error analyzing sentiment: {str(e)}"}
 
 
@@ -202,21 +223,20 @@ def get_symbol_sentiment(symbol: str) -> str:
         if not news:
             return f"No news found for {symbol}"
         
-        sentiments = []
-        model_used = "Unknown"
+        # Titles live under 'content' in newer yfinance payloads
+        titles = [t for t in (item.get("content", item).get("title", "") for item in news) if t]
         
-        for item in news:
-            title = item.get("title", "")
-            if title:
-                result = analyze_sentiment(title)
-                if "polarity" in result:
-                    sentiments.append(result["polarity"])
-                    model_used = result.get("model", "Unknown")
+        # Each title is a separate FinBERT request; the Modal endpoint
+        # serves up to 10 inputs concurrently, so score them in parallel
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            results = [r for r in executor.map(analyze_sentiment, titles) if "polarity" in r]
         
-        if not sentiments:
+        if not results:
             return f"No valid news titles for {symbol}"
         
-        avg_polarity = sum(sentiments) / len(sentiments)
+        sentiments = np.fromiter((r["polarity"] for r in results), dtype=np.float64, count=len(results))
+        model_used = results[-1].get("model", "Unknown")
+        avg_polarity = sentiments.mean()
         
         if avg_polarity > 0.1:
             classification = "BULLISH"
@@ -233,40 +253,44 @@ def get_symbol_sentiment(symbol: str) -> str:
     except Exception as e:
         return f"Error analyzing sentiment for {symbol}: {str(e)}"
 
+def _watchlist_headline(symbol: str) -> str:
+    """Top headline line for one watchlist symbol, falling back to GNews."""
+    try:
+        # Try yfinance first
+        ticker = yf.Ticker(symbol)
+        news = ticker.news
+        
+        # If yfinance empty, try GNews
+        if not news:
+            gnews_results = get_google_news(symbol, max_items=1)
+            if gnews_results:
+                top_item = gnews_results[0]
+                title = top_item.get("title", "No Title")
+                publisher = top_item.get("publisher", "Unknown")
+                return f"[{symbol}] {title} ({publisher})"
+            return f"[{symbol}] No recent news."
+        
+        top_item = news[0]
+        title = top_item.get("title", "No Title")
+        publisher = top_item.get("publisher", "Unknown")
+        return f"[{symbol}] {title} ({publisher})"
+    except Exception as e:
+        logger.error("Error fetching news for %s: %s", symbol, e)
+        return f"[{symbol}] Error fetching news."
+
 def get_latest_news_for_watchlist() -> str:
     """
     Aggregates the top news headline for each symbol in the watchlist.
     Falls back to GNews if yfinance returns no results.
     """
-    watchlist = _load_watchlist()
+    watchlist = sorted(_load_watchlist())
     if not watchlist:
         return "Watchlist is empty."
         
     summary = ["=== LATEST NEWS (Watchlist) ==="]
     
-    for symbol in watchlist:
-        try:
-            # Try yfinance first
-            ticker = yf.Ticker(symbol)
-            news = ticker.news
-            
-            # If yfinance empty, try GNews
-            if not news:
-                gnews_results = get_google_news(symbol, max_items=1)
-                if gnews_results:
-                    top_item = gnews_results[0]
-                    title = top_item.get("title", "No Title")
-                    publisher = top_item.get("publisher", "Unknown")
-                    summary.append(f"[{symbol}] {title} ({publisher})")
-                else:
-                    summary.append(f"[{symbol}] No recent news.")
-            else:
-                top_item = news[0]
-                title = top_item.get("title", "No Title")
-                publisher = top_item.get("publisher", "Unknown")
-                summary.append(f"[{symbol}] {title} ({publisher})")
-        except Exception as e:
-            logger.error(f"Error fetching news for {symbol}: {e}")
-            summary.append(f"[{symbol}] Error fetching news.")
+    # Each lookup is an independent HTTP round-trip; map keeps watchlist order
+    with ThreadPoolExecutor(max_workers=min(16, len(watchlist))) as executor:
+        summary.extend(executor.map(_watchlist_headline, watchlist))
             
     return "\n".join(summary)
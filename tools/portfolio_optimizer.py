@@ -1,63 +1,41 @@
+import math
 import numpy as np
 import pandas as pd
 import yfinance as yf
-from scipy.optimize import minimize
 from typing import List, Dict
 import logging
 import json
+from concurrent.futures import ThreadPoolExecutor
+from tools.market_data import _get_price_df
 
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# Helper function for fetching price data, mimicking yfinance output structure
-# This function is assumed to exist or be provided elsewhere,
-# but for the purpose of making the provided code syntactically correct,
-# a placeholder implementation using yfinance is provided.
-def get_price(ticker: str, period: str, interval: str) -> str:
-    """
-    Fetches historical price data for a given ticker and returns it as a JSON string.
-    This is a placeholder to satisfy the new mean_variance_optimize function's dependency.
-    In a real scenario, this might be an API call or a more sophisticated data fetcher.
-    """
-    try:
-        data = yf.download(ticker, period=period, interval=interval, progress=False)
-        if data.empty:
-            return json.dumps([])
-        # Rename columns to match expected structure if necessary, e.g., 'Date' instead of index
-        data_reset = data.reset_index()
-        data_reset['Date'] = data_reset['Date'].dt.strftime('%Y-%m-%d') # Format date as string
-        # Select relevant columns, e.g., 'Date', 'Close'
-        # The new code expects 'Date' and 'Close' to be present.
-        # If other columns are needed, adjust here.
-        history_list = data_reset[['Date', 'Close']].to_dict(orient='records')
-        return json.dumps(history_list)
-    except Exception as e:
-        logger.error(f"Error fetching data for {ticker} with yfinance: {e}")
-        return json.dumps([])
-
 def mean_variance_optimize(tickers: List[str], lookback: str = "1y") -> str:
     """
     Calculates optimal portfolio weights using Mean-Variance Optimization (Max Sharpe).
     """
+    from scipy.optimize import minimize  # deferred: scipy is slow to import at server start
+    
     try:
-        logger.info(f"Starting Mean-Variance Optimization for: {tickers}")
+        logger.info("Starting Mean-Variance Optimization for: %s", tickers)
         
         # 1. Fetch Data
+        # One HTTP round-trip per ticker; overlap them instead of paying each in turn
+        with ThreadPoolExecutor(max_workers=min(16, len(tickers)) or 1) as executor:
+            histories = list(executor.map(lambda t: _get_price_df(t, interval="1d", period="1y"), tickers))
+        
         data = {}
-        for ticker in tickers:
-            # Get 1 year of data
-            history_json = get_price(ticker, period="1y", interval="1d")
-            history = json.loads(history_json)
-            
-            if not history:
-                logger.warning(f"Optimization skipped: No data for {ticker}")
+        for ticker, history in zip(tickers, histories):
+            if history.empty:
+                logger.warning("Optimization skipped: No data for %s", ticker)
                 return f"Could not fetch data for {ticker}"
                 
-            df = pd.DataFrame(history)
-            df['Date'] = pd.to_datetime(df['Date'])
-            df.set_index('Date', inplace=True)
-            data[ticker] = df['Close']
+            close = history.set_index('Date')['Close']
+            # Align on calendar dates across exchanges/timezones
+            close.index = close.index.tz_localize(None).normalize()
+            data[ticker] = close
             
         prices = pd.DataFrame(data)
         returns = prices.pct_change().dropna()
@@ -68,42 +46,61 @@ def mean_variance_optimize(tickers: List[str], lookback: str = "1y") -> str:
             
         # 2. Optimization Setup
         n_assets = len(tickers)
-        mean_returns = returns.mean() * 252
-        cov_matrix = returns.cov() * 252
+        # Annualised moments on plain arrays; SLSQP calls the objective many times.
+        # Sample covariance as one GEMM over the centered returns (same ddof=1 as pandas)
+        R = returns.to_numpy(dtype=np.float64)
+        daily_mean = R.mean(axis=0)
+        mu = daily_mean * 252
+        Xc = R - daily_mean
+        cov = (Xc.T @ Xc) * (252.0 / (len(R) - 1))
         
-        # Objective: Maximize Sharpe Ratio (Minimize negative Sharpe)
+        # Objective: Maximize Sharpe Ratio (Minimize negative Sharpe).
+        # Returns the value and its analytic gradient together (jac=True),
+        # sharing cov @ w, so SLSQP never falls back to finite differences
         def negative_sharpe(weights):
-            p_ret = np.sum(weights * mean_returns)
-            p_vol = np.sqrt(np.dot(weights.T, np.dot(cov_matrix, weights)))
+            cov_w = cov @ weights
+            p_vol = math.sqrt(weights @ cov_w)
             # Handle potential division by zero or very small volatility
             if p_vol < 1e-6:
-                return 1e10 # Return a very large number to penalize near-zero volatility
-            return -p_ret / p_vol
+                return 1e10, np.zeros_like(weights) # Penalize near-zero volatility
+            p_ret = weights @ mu
+            return -p_ret / p_vol, p_ret * cov_w / p_vol**3 - mu / p_vol
             
-        # Constraints: Sum of weights = 1
-        constraints = ({'type': 'eq', 'fun': lambda x: np.sum(x) - 1})
+        # Constraints: Sum of weights = 1 (constant gradient)
+        constraints = ({'type': 'eq', 'fun': lambda x: np.sum(x) - 1, 'jac': lambda x: np.ones_like(x)})
         # Bounds: 0 <= weight <= 1 (Long only)
         bounds = tuple((0, 1) for _ in range(n_assets))
         # Initial Guess: Equal weights
         init_guess = n_assets * [1. / n_assets]
         
         # 3. Run Optimization
-        result = minimize(negative_sharpe, init_guess, method='SLSQP', bounds=bounds, constraints=constraints)
-        
-        if not result.success:
-            logger.error(f"Optimization failed: {result.message}")
-            return f"Optimization failed: {result.message}"
-            
-        optimal_weights = result.x
+        # Unconstrained max-Sharpe weights are proportional to inv(cov) @ mu. When none
+        # are negative the long-only bounds are slack and this is the exact optimum.
+        optimal_weights = None
+        try:
+            inv_cov_mu = np.linalg.solve(cov, mu)
+            if inv_cov_mu.sum() > 0 and (inv_cov_mu >= 0).all():
+                optimal_weights = inv_cov_mu / inv_cov_mu.sum()
+        except np.linalg.LinAlgError:
+            logger.warning("Covariance matrix is singular, falling back to SLSQP")
+
+        if optimal_weights is None:
+            result = minimize(negative_sharpe, init_guess, method='SLSQP', jac=True, bounds=bounds, constraints=constraints)
+
+            if not result.success:
+                logger.error("Optimization failed: %s", result.message)
+                return f"Optimization failed: {result.message}"
+
+            optimal_weights = result.x
         
         # 4. Format Output
         allocation = {ticker: weight for ticker, weight in zip(tickers, optimal_weights) if weight > 0.01}
         
-        p_ret = np.sum(optimal_weights * mean_returns)
-        p_vol = np.sqrt(np.dot(optimal_weights.T, np.dot(cov_matrix, optimal_weights)))
+        p_ret = optimal_weights @ mu
+        p_vol = math.sqrt(optimal_weights @ cov @ optimal_weights)
         sharpe = p_ret / p_vol
         
-        logger.info(f"Optimization completed. Max Sharpe: {sharpe:.2f}")
+        logger.info("Optimization completed. Max Sharpe: %.2f", sharpe)
         
         return (
             f"Optimal Allocation (Max Sharpe):\n"
@@ -114,7 +111,7 @@ def mean_variance_optimize(tickers: List[str], lookback: str = "1y") -> str:
         )
         
     except Exception as e:
-        logger.error(f"Optimization error: {e}", exc_info=True)
+        logger.error("Optimization error: %s", e, exc_info=True)
         return f"Error optimizing portfolio: {str(e)}"
 
 def risk_parity(tickers: List[str]) -> str:
@@ -122,13 +119,20 @@ def risk_parity(tickers: List[str]) -> str:
     Calculates weights based on Inverse Volatility (Naive Risk Parity).
     """
     data = yf.download(tickers, period="1y", progress=False)['Close']
-    returns = data.pct_change().dropna()
-    volatility = returns.std()
+    if isinstance(data, pd.Series):
+        data = data.to_frame(name=tickers[0])
+    
+    # Daily simple returns on the raw array; rows with a missing close are
+    # dropped, as pct_change().dropna() would
+    prices = data.to_numpy(dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = prices[1:] / prices[:-1] - 1
+    returns = returns[np.isfinite(returns).all(axis=1)]
+    volatility = returns.std(axis=0, ddof=1)
     
     inv_vol = 1 / volatility
     weights = inv_vol / inv_vol.sum()
     
-    w_dict = weights.to_dict()
-    w_dict = {k: float(f"{v:.4f}") for k, v in w_dict.items()}
+    w_dict = dict(zip(data.columns, np.round(weights, 4).tolist()))
     
     return f"Risk Parity Weights: {w_dict}"
@@ -1,80 +1,224 @@
+import functools
+import time
+from statistics import NormalDist
 import numpy as np
 import pandas as pd
 import yfinance as yf
-from typing import Dict, Any, List, Optional, Literal
+from typing import Dict, Optional, Literal, Tuple
 from tools.execution import get_positions
+from tools._kernels import mc_final_values
+from config import MC_BACKEND
 import logging
 
 logger = logging.getLogger(__name__)
 
+_PRICE_TTL = 60  # seconds
+_MC_BLOCK_PATHS = 4096  # Monte Carlo paths per shock buffer (~8 MB at 252 days)
+
+
+@functools.lru_cache(maxsize=8)
+def _fetch_prices(tickers: tuple, lookback: str, bucket: int) -> Tuple[tuple, np.ndarray, np.ndarray]:
+    # `bucket` rolls over every _PRICE_TTL seconds, so back-to-back risk
+    # calls share one download while stale entries age out of the cache.
+    # The arrays are shared between calls, so they are made read-only.
+    data = yf.download(list(tickers), period=lookback, progress=False)['Close']
+    if isinstance(data, pd.Series):
+        data = data.to_frame(name=tickers[0])
+    if data.empty:
+        # Don't pin a failed download for the rest of the bucket
+        raise LookupError(f"No price data for {', '.join(tickers)}")
+    
+    # (T, K) C-contiguous block, one column per asset
+    prices = np.ascontiguousarray(data.to_numpy(dtype=np.float64))
+    
+    # Daily log returns per column, one fused pass; rows touching a missing
+    # price are dropped, as pct_change().dropna() would
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_rets = np.log(prices[1:] / prices[:-1])
+    log_rets = log_rets[np.isfinite(log_rets).all(axis=1)]
+    
+    prices.setflags(write=False)
+    log_rets.setflags(write=False)
+    return tuple(data.columns), prices, log_rets
+
+
 def _get_portfolio_data(lookback: str = "1y"):
+    """
+    Prices and returns for the current positions, as numpy arrays.
+    
+    Returns:
+        (prices, weights, log_rets, port_returns): (T, K) closes, value weights
+        and (N, K) daily log returns sharing one column order, and the
+        portfolio's daily arithmetic returns. All None when there are no positions.
+    """
     portfolio = get_positions()
     positions = portfolio.get("positions", {})
     if not positions:
-        return None, None
-    
-    tickers = list(positions.keys())
-    weights = np.array(list(positions.values())) # This is qty, need value weights
+        return None, None, None, None
+    return _portfolio_arrays(positions, lookback)
+
+def _portfolio_arrays(positions: Dict[str, float], lookback: str):
+    """_get_portfolio_data for an already-fetched {symbol: qty} mapping."""
+    # Sorted so every caller shares one cache entry per set of holdings
+    tickers = tuple(sorted(positions))
     
     # Fetch data
-    data = yf.download(tickers, period=lookback, progress=False)['Close']
-    if isinstance(data, pd.Series):
-        data = data.to_frame(name=tickers[0])
+    columns, prices, log_rets = _fetch_prices(tickers, lookback, int(time.time() // _PRICE_TTL))
         
     # Calculate current value weights
-    current_prices = data.iloc[-1]
-    values = current_prices * pd.Series(positions)
-    total_value = values.sum()
-    weights = values / total_value
+    qty = np.array([positions[c] for c in columns], dtype=np.float64)
+    values = prices[-1] * qty
+    weights = values / np.nansum(values)
+    
+    # Daily portfolio returns, shared by every metric below. Asset returns
+    # compound, so the portfolio's simple return is w . expm1(log_rets)
+    port_returns = np.expm1(log_rets) @ weights
+    
+    return prices, weights, log_rets, port_returns
+
+@functools.lru_cache(maxsize=4)
+def _mc_params(positions: tuple, lookback: str, bucket: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Fitted Monte Carlo inputs (mean log returns, covariance factor, weights)
+    for a sorted tuple of (symbol, qty) holdings. `bucket` follows the price
+    cache, so a refit happens when prices are refreshed.
+    
+    Raises:
+        ValueError: if the history cannot support a covariance estimate
+    """
+    # Log returns for additivity
+    _, weights, log_returns, _ = _portfolio_arrays(dict(positions), lookback)
+    
+    if len(log_returns) < 2:
+        raise ValueError("Insufficient data history for a covariance estimate.")
     
-    return data, weights
+    mean_log_returns = log_returns.mean(axis=0)
+    
+    # Shrunk covariance is positive definite even when history is short
+    # relative to the number of holdings, so Cholesky always succeeds
+    cov = _ledoit_wolf(log_returns - mean_log_returns)
+    try:
+        L = np.linalg.cholesky(cov)
+    except np.linalg.LinAlgError:
+        raise ValueError("Insufficient price variation for a covariance estimate.")
+    
+    for arr in (mean_log_returns, L, weights):
+        arr.setflags(write=False)
+    return mean_log_returns, L, weights
+
+def _ledoit_wolf(X: np.ndarray) -> np.ndarray:
+    """
+    Ledoit-Wolf shrunk covariance of centered samples X (n, k).
+    
+    Blends the (1/n) sample covariance with a scaled identity, using the
+    optimal shrinkage intensity from Ledoit & Wolf (2004); same estimator
+    as sklearn.covariance.LedoitWolf.
+    """
+    n, k = X.shape
+    emp_cov = (X.T @ X) / n
+    mu = np.trace(emp_cov) / k
+    if k == 1:
+        return emp_cov
+    
+    X2 = X ** 2
+    beta = (np.sum(X2.T @ X2) / n - np.sum(emp_cov ** 2)) / (k * n)
+    delta = np.sum((emp_cov - mu * np.eye(k)) ** 2) / k
+    shrinkage = 0.0 if delta == 0 else min(beta, delta) / delta
+    
+    shrunk = (1.0 - shrinkage) * emp_cov
+    shrunk.flat[::k + 1] += shrinkage * mu
+    return shrunk
+
+@functools.lru_cache(maxsize=1)
+def _jax_mc_kernel():
+    """Jitted JAX twin of mc_final_values, built on first use; None without jax."""
+    try:
+        import jax
+        import jax.numpy as jnp
+    except ImportError:
+        logger.warning("MC_BACKEND=jax but jax is not installed; using the Numba kernel")
+        return None
+    
+    @functools.partial(jax.jit, static_argnums=(3, 4))
+    def kernel(key, drift, sigma, days, sims):
+        z = jax.random.normal(key, (sims, days)).sum(axis=1)
+        return jnp.exp(days * drift + sigma * z)
+    
+    return jax, kernel
+
+def _mc_final_values_jax(L: np.ndarray, mu: np.ndarray, w: np.ndarray, days: int, sims: int, seed: Optional[int]) -> Optional[np.ndarray]:
+    """Terminal path values on the JAX backend (GPU/TPU when present), or None if jax is unavailable."""
+    built = _jax_mc_kernel()
+    if built is None:
+        return None
+    jax, kernel = built
+    # Same projection as the Numba kernel: w . (mu + L z) ~ N(w . mu, |L.T w|^2) per day
+    drift = float(w @ mu)
+    sigma = float(np.linalg.norm(L.T @ w))
+    if seed is None:
+        seed = int(np.random.default_rng().integers(2**32))
+    return np.asarray(kernel(jax.random.PRNGKey(seed), drift, sigma, days, sims), dtype=np.float64)
 
 def portfolio_risk() -> str:
     """Returns annualized volatility of the portfolio."""
-    data, weights = _get_portfolio_data()
-    if data is None:
+    try:
+        prices, _, _, port_returns = _get_portfolio_data()
+    except LookupError as e:
+        logger.warning("Risk metric skipped: %s", e)
+        return str(e)
+    if prices is None:
         return "Portfolio is empty."
     
-    returns = data.pct_change().dropna()
-    cov_matrix = returns.cov() * 252
-    port_variance = np.dot(weights.T, np.dot(cov_matrix, weights))
-    port_volatility = np.sqrt(port_variance)
+    # std of w.r equals sqrt(w' cov w) for the same ddof, without forming cov
+    port_volatility = np.std(port_returns, ddof=1) * np.sqrt(252)
     
     return f"Annualized Portfolio Volatility: {port_volatility:.2%}"
 
-def var(confidence: float = 0.95) -> str:
-    """Calculates Value at Risk (VaR)."""
-    data, weights = _get_portfolio_data()
-    if data is None:
-        return "Portfolio is empty."
+def var(confidence: float = 0.95, method: Literal["parametric", "historical"] = "parametric") -> str:
+    """
+    Calculates daily Value at Risk (VaR).
     
-    returns = data.pct_change().dropna()
-    # Portfolio historical returns
-    port_returns = returns.dot(weights)
+    Args:
+        confidence: Confidence level.
+        method: 'parametric' fits a normal to the mean and std of daily returns;
+            'historical' takes the empirical percentile of past returns.
+    """
+    try:
+        prices, _, _, port_returns = _get_portfolio_data()
+    except LookupError as e:
+        logger.warning("Risk metric skipped: %s", e)
+        return str(e)
+    if prices is None:
+        return "Portfolio is empty."
     
-    # Parametric VaR
-    mean = np.mean(port_returns)
-    std = np.std(port_returns)
-    var_val = np.percentile(port_returns, (1 - confidence) * 100)
+    if method == "historical":
+        var_val = np.percentile(port_returns, (1 - confidence) * 100)
+    else:
+        # Parametric VaR: one pass for the moments, no sort
+        mean = np.mean(port_returns)
+        std = np.std(port_returns)
+        var_val = mean + std * NormalDist().inv_cdf(1 - confidence)
     
     return f"Daily VaR ({confidence:.0%}): {var_val:.2%}"
 
 def max_drawdown() -> str:
     """Calculates Maximum Drawdown."""
-    data, weights = _get_portfolio_data()
-    if data is None:
+    try:
+        prices, _, _, port_returns = _get_portfolio_data()
+    except LookupError as e:
+        logger.warning("Risk metric skipped: %s", e)
+        return str(e)
+    if prices is None:
         return "Portfolio is empty."
     
-    returns = data.pct_change().dropna()
-    port_returns = returns.dot(weights)
-    cumulative_returns = (1 + port_returns).cumprod()
-    peak = cumulative_returns.expanding(min_periods=1).max()
-    drawdown = (cumulative_returns / peak) - 1
-    max_dd = drawdown.min()
+    cumulative_returns = np.cumprod(1 + port_returns)
+    peak = np.maximum.accumulate(cumulative_returns)
+    # Drawdowns are <= 0, so initial=0.0 only matters for an empty series
+    max_dd = float((cumulative_returns / peak - 1).min(initial=0.0))
     
     return f"Maximum Drawdown: {max_dd:.2%}"
 
-def monte_carlo_simulation(simulations: int = 1000, days: int = 252, visualize: bool = False) -> str:
+def monte_carlo_simulation(simulations: int = 1000, days: int = 252, visualize: bool = False, seed: Optional[int] = None) -> str:
     """
     Runs a Monte Carlo simulation using Geometric Brownian Motion (Log Returns).
     
@@ -82,44 +226,41 @@ def monte_carlo_simulation(simulations: int = 1000, days: int = 252, visualize:
         simulations: Number of paths to simulate.
         days: Number of days to project forward.
         visualize: If True, returns a histogram of final outcomes.
+        seed: Seed for the random generator, for reproducible runs.
     """
-    data, weights = _get_portfolio_data()
-    if data is None:
+    positions = get_positions().get("positions", {})
+    if not positions:
         return "Portfolio is empty."
     
-    # Use Log Returns for additivity
-    log_returns = np.log(data / data.shift(1)).dropna()
-    
-    mean_log_returns = log_returns.mean()
-    cov_matrix = log_returns.cov()
-    
-    # Cholesky Decomposition
+    # The fitted model only changes with the holdings or the price cache, so
+    # repeated runs (e.g. from the dashboard) just draw new paths
     try:
-        L = np.linalg.cholesky(cov_matrix)
-    except np.linalg.LinAlgError:
-        # Fallback for non-positive definite matrix (e.g., too few data points)
-        return "Covariance matrix is not positive definite. Insufficient data history."
+        mean_log_returns, L, weights = _mc_params(
+            tuple(sorted(positions.items())), "1y", int(time.time() // _PRICE_TTL)
+        )
+    except LookupError as e:
+        logger.warning("Monte Carlo skipped: %s", e)
+        return str(e)
+    except ValueError as e:
+        return str(e)
     
-    portfolio_sims = np.zeros((days, simulations))
-    initial_value = 1.0 
+    final_values = None
+    if MC_BACKEND == "jax":
+        final_values = _mc_final_values_jax(L, mean_log_returns, weights, days, simulations, seed)
+    if final_values is None:
+        # Paths are generated a block at a time, so memory stays O(simulations)
+        # plus one reusable shock buffer. PCG64 fills it in place; the stream
+        # is consumed in the same order as one big draw, so seeds reproduce
+        rng = np.random.default_rng(seed)
+        final_values = np.empty(simulations)
+        shocks = np.empty((min(_MC_BLOCK_PATHS, simulations), days))
+        for start in range(0, simulations, _MC_BLOCK_PATHS):
+            block = shocks[:min(_MC_BLOCK_PATHS, simulations - start)]
+            rng.standard_normal(out=block)
+            final_values[start:start + len(block)] = mc_final_values(L, mean_log_returns, weights, block)
     
-    for i in range(simulations):
-        Z = np.random.normal(size=(days, len(weights)))
-        # Correlated random shocks
-        daily_shocks = np.dot(Z, L.T)
-        
-        # GBM: S_t = S_0 * exp( (mu - 0.5*sigma^2)*t + sigma*W_t )
-        # Here we simulate daily steps
-        daily_log_ret = mean_log_returns.values + daily_shocks
-        
-        # Portfolio level log return
-        port_log_ret = np.dot(daily_log_ret, weights)
-        
-        # Accumulate log returns
-        cum_log_ret = np.cumsum(port_log_ret)
-        portfolio_sims[:, i] = initial_value * np.exp(cum_log_ret)
-        
-    final_values = portfolio_sims[-1, :]
+    initial_value = 1.0 
+    final_values = initial_value * final_values
     returns = (final_values - 1) * 100  # Convert to percentage
     expected_return = np.mean(final_values) - 1
     worst_case = np.percentile(final_values, 5) - 1
@@ -142,7 +283,7 @@ def monte_carlo_simulation(simulations: int = 1000, days: int = 252, visualize:
             )
             result += f"\n\n{chart}"
         except Exception as e:
-            logger.error(f"Error generating visualization: {e}")
+            logger.error("Error generating visualization: %s", e)
             result += f"\n(Visualization error: {str(e)})"
     
     return result
@@ -185,5 +326,5 @@ def validate_trade(symbol: str, side: Literal["buy", "sell"], qty: float, curren
         logger.warning(msg)
         return msg
         
-    logger.info(f"Trade validated: {side.upper()} {qty} {symbol} (${trade_value:.2f})")
+    logger.info("Trade validated: %s %s %s ($%.2f)", side.upper(), qty, symbol, trade_value)
     return None
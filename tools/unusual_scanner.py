@@ -51,7 +51,7 @@ def _get_alpaca_client() -> Optional[StockHistoricalDataClient]:
             _data_client = StockHistoricalDataClient(ALPACA_API_KEY, ALPACA_SECRET_KEY)
             logger.info("Alpaca data client initialized for market scanner")
         except Exception as e:
-            logger.error(f"Failed to initialize Alpaca data client: {e}")
+            logger.error("Failed to initialize Alpaca data client: %s", e)
             return None
     
     return _data_client
@@ -121,7 +121,7 @@ def _fetch_ticker_data_alpaca(symbol: str) -> Optional[Dict[str, Any]]:
             "low": round(latest.low, 2),
         }
     except Exception as e:
-        logger.debug(f"Error fetching {symbol} from Alpaca: {e}")
+        logger.debug("Error fetching %s from Alpaca: %s", symbol, e)
         return None
 
 
@@ -133,7 +133,7 @@ def _fetch_market_snapshot(tickers: List[str], max_workers: int = 10) -> List[Di
         logger.info("Using cached market snapshot")
         return _CACHE["data"]
     
-    logger.info(f"Fetching market snapshot for {len(tickers)} tickers via Alpaca...")
+    logger.info("Fetching market snapshot for %s tickers via Alpaca...", len(tickers))
     results = []
     
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
@@ -148,7 +148,7 @@ def _fetch_market_snapshot(tickers: List[str], max_workers: int = 10) -> List[Di
     _CACHE["data"] = results
     _CACHE["timestamp"] = datetime.now()
     
-    logger.info(f"Fetched data for {len(results)} tickers from Alpaca")
+    logger.info("Fetched data for %s tickers from Alpaca", len(results))
     return results
 
 
@@ -266,7 +266,7 @@ def scan_unusual_activity(
         if not data_client:
             return "❌ Alpaca data client not initialized. Check API credentials in .env file."
         
-        logger.info(f"Running unusual activity scan: {criteria}")
+        logger.info("Running unusual activity scan: %s", criteria)
         
         # Run appropriate scanner
         if criteria == "big_movers":
@@ -314,11 +314,11 @@ def scan_unusual_activity(
                 )
                 result_text += f"\n\n{chart}"
             except Exception as e:
-                logger.error(f"Error generating visualization: {e}")
+                logger.error("Error generating visualization: %s", e)
                 result_text += f"\n(Visualization error: {str(e)})"
         
         return result_text
         
     except Exception as e:
-        logger.error(f"Error in unusual activity scan: {e}", exc_info=True)
+        logger.error("Error in unusual activity scan: %s", e, exc_info=True)
         return f"Error scanning market: {str(e)}"
@@ -135,7 +135,7 @@ def plot_candlestick(
         
         return _encode_figure(fig)
     except Exception as e:
-        logger.error(f"Error creating candlestick chart: {e}")
+        logger.error("Error creating candlestick chart: %s", e)
         # Fallback to simple line chart
         return plot_line(
             {'x': list(range(len(df))), 'y': df['Close'].tolist()},
@@ -378,5 +378,5 @@ def plot_data(
             raise ValueError(f"Unknown chart type: {chart_type}")
             
     except Exception as e:
-        logger.error(f"Error creating chart: {e}", exc_info=True)
+        logger.error("Error creating chart: %s", e, exc_info=True)
         return f"Error creating chart: {str(e)}"
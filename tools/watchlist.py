@@ -1,26 +1,59 @@
 import json
+import pandas as pd
 import yfinance as yf
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set
 import logging
 from config import DATA_DIR
 
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is used otherwise
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 WATCHLIST_FILE = DATA_DIR / "watchlist.json"
 
-def _load_watchlist() -> List[str]:
-    if not WATCHLIST_FILE.exists():
-        return []
+# File stat (mtime_ns, size) of the last watchlist parsed or written, with its
+# symbols. Swapped as one tuple so concurrent readers never see a torn pair.
+_cache: tuple = (None, frozenset())
+
+def _stat_key() -> tuple:
+    st = WATCHLIST_FILE.stat()
+    return (st.st_mtime_ns, st.st_size)
+
+def _read_watchlist() -> frozenset:
     try:
-        with open(WATCHLIST_FILE, "r") as f:
-            return json.load(f)
+        raw = WATCHLIST_FILE.read_bytes()
+        return frozenset(orjson.loads(raw) if orjson is not None else json.loads(raw))
     except Exception:
-        return []
+        return frozenset()
+
+def _load_watchlist() -> Set[str]:
+    global _cache
+    try:
+        key = _stat_key()
+    except OSError:
+        return set()
+    cached_key, symbols = _cache
+    # Keyed on the file's stat so any external rewrite is picked up
+    if key != cached_key:
+        symbols = _read_watchlist()
+        _cache = (key, symbols)
+    # Fresh set each call; callers add/discard in place
+    return set(symbols)
 
-def _save_watchlist(watchlist: List[str]):
-    with open(WATCHLIST_FILE, "w") as f:
-        json.dump(watchlist, f, indent=4)
+def _save_watchlist(watchlist: Set[str]):
+    global _cache
+    # Stored as a sorted JSON array so the file stays stable and readable;
+    # both encoders produce the same bytes for a list of symbols
+    if orjson is not None:
+        WATCHLIST_FILE.write_bytes(orjson.dumps(sorted(watchlist), option=orjson.OPT_INDENT_2))
+    else:
+        WATCHLIST_FILE.write_text(json.dumps(sorted(watchlist), indent=2))
+    # We know what we just wrote, so the next load needn't parse it back
+    _cache = (_stat_key(), frozenset(watchlist))
 
 def add_to_watchlist(symbol: str) -> str:
     """
@@ -29,9 +62,9 @@ def add_to_watchlist(symbol: str) -> str:
     symbol = symbol.upper()
     watchlist = _load_watchlist()
     if symbol not in watchlist:
-        watchlist.append(symbol)
+        watchlist.add(symbol)
         _save_watchlist(watchlist)
-        logger.info(f"Added {symbol} to watchlist")
+        logger.info("Added %s to watchlist", symbol)
         return f"Added {symbol} to watchlist."
     return f"{symbol} is already in the watchlist."
 
@@ -42,33 +75,63 @@ def remove_from_watchlist(symbol: str) -> str:
     symbol = symbol.upper()
     watchlist = _load_watchlist()
     if symbol in watchlist:
-        watchlist.remove(symbol)
+        watchlist.discard(symbol)
         _save_watchlist(watchlist)
-        logger.info(f"Removed {symbol} from watchlist")
+        logger.info("Removed %s from watchlist", symbol)
         return f"Removed {symbol} from watchlist."
     return f"{symbol} was not in the watchlist."
 
+def _yf_quotes(symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Latest daily close per symbol from one batched yfinance download."""
+    try:
+        # Today's daily bar updates intraday; a few days back covers weekends and holidays
+        closes = yf.download(symbols, period="5d", interval="1d", progress=False, threads=True)['Close']
+        if isinstance(closes, pd.Series):
+            closes = closes.to_frame(name=symbols[0])
+    except Exception as e:
+        return {symbol: {"error": str(e)} for symbol in symbols}
+    
+    quotes = {}
+    for symbol in symbols:
+        try:
+            price = closes[symbol].dropna().iloc[-1]
+            quotes[symbol] = {
+                "price": float(price),
+                "status": "Active"
+            }
+        except (KeyError, IndexError):
+            quotes[symbol] = {"error": f"No price data for {symbol}"}
+    return quotes
+
 def get_watchlist_data() -> Dict[str, Any]:
     """
     Fetches current data for all symbols in the watchlist.
     """
-    watchlist = _load_watchlist()
+    watchlist = sorted(_load_watchlist())
     if not watchlist:
         return {}
     
+    # One batched Alpaca request covers every US equity symbol
+    prices = {}
+    try:
+        from tools.alpaca_broker import get_broker
+        prices = get_broker().get_latest_prices(watchlist)
+    except Exception as e:
+        logger.warning("Batched Alpaca quote failed, falling back to yfinance: %s", e)
+    
+    # yfinance fallback for anything Alpaca doesn't cover (crypto, indices, ...),
+    # again as a single batched request
+    missing = [symbol for symbol in watchlist if symbol not in prices]
+    fallback = _yf_quotes(missing) if missing else {}
+    
     data = {}
     for symbol in watchlist:
-        try:
-            ticker = yf.Ticker(symbol)
-            # fast_info is faster for real-time-ish data
-            price = ticker.fast_info.last_price
-            change = 0.0 # yfinance fast_info doesn't always have change % easily accessible without full history
-            # Let's try to get a bit more if possible, but keep it fast
+        if symbol in prices:
             data[symbol] = {
-                "price": price,
+                "price": prices[symbol],
                 "status": "Active"
             }
-        except Exception as e:
-            data[symbol] = {"error": str(e)}
+        else:
+            data[symbol] = fallback[symbol]
             
     return data